@@ -1,6 +1,47 @@
 
+import logging
+
 import gspread
-from app.utils.google_sheets import get_client, log_product, log_activity
+from app.utils.google_sheets import (
+    SPREADSHEET_URL,
+    get_client,
+    get_drive_service,
+    log_product,
+    log_activity,
+    flush_logs
+)
+
+logger = logging.getLogger(__name__)
+
+# Template payloads are static, so they are built once at import time
+PLANNER_ROWS = [["Time", "Task", "Notes"]] + [[f"{h}:00", "", ""] for h in range(6, 22)]
+
+PLANNER_VALUES = [
+    {"range": "A1:B1", "values": [["Daily Planner", "Date: ___________"]]},
+    {"range": f"A3:C{2 + len(PLANNER_ROWS)}", "values": PLANNER_ROWS},
+]
+
+PLANNER_FORMATS = [
+    {"range": "A1:B1", "format": {"textFormat": {"bold": True, "fontSize": 14}}},
+    {"range": "A3:C3", "format": {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}}},
+]
+
+BUDGET_INCOME = [["Salary", 0], ["Side Hustle", 0], ["Total", "=SUM(B4:B5)"]]
+BUDGET_EXPENSES = [["Rent", 1000, 1000, "=E4-F4"], ["Groceries", 300, 0, "=E5-F5"]]
+
+BUDGET_VALUES = [
+    {"range": "A1", "values": [["Monthly Budget Tracker"]]},
+    {"range": "A3:B3", "values": [["Income Source", "Amount"]]},
+    {"range": "A4:B6", "values": BUDGET_INCOME},
+    {"range": "D3:G3", "values": [["Expense Category", "Planned", "Actual", "Difference"]]},
+    {"range": "D4:G5", "values": BUDGET_EXPENSES},
+]
+
+BUDGET_FORMATS = [
+    {"range": "A1", "format": {"textFormat": {"bold": True, "fontSize": 14}}},
+    {"range": "A3:B3", "format": {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.95, "blue": 0.9}}},
+    {"range": "D3:G3", "format": {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.95, "green": 0.9, "blue": 0.9}}},
+]
 
 class CreationAgent:
     def __init__(self):
@@ -10,35 +51,35 @@ class CreationAgent:
     def run(self, trend_data):
         """Creates a product based on the trend data."""
         keyword = trend_data.get("keyword", "Untitled Product")
-        print(f"[{self.name}] Starting product creation for: {keyword}")
+        logger.info("[%s] Starting product creation for: %s", self.name, keyword)
         log_activity(self.name, "Start", f"Creating product for: {keyword}")
 
         try:
             # Create a new spreadsheet
             sheet_name = f"{keyword.title()} - {trend_data.get('platform', 'MVP')}"
-            print(f"[{self.name}] Creating spreadsheet: {sheet_name}")
+            logger.info("[%s] Creating spreadsheet: %s", self.name, sheet_name)
             sh = self.client.create(sheet_name)
-            print(f"[{self.name}] Spreadsheet created successfully")
+            logger.debug("[%s] Spreadsheet created successfully", self.name)
             
             # Apply template based on keyword
             if "planner" in keyword.lower():
-                print(f"[{self.name}] Applying planner template")
+                logger.debug("[%s] Applying planner template", self.name)
                 self.create_planner_template(sh)
                 type_ = "Planner"
             elif "budget" in keyword.lower() or "finance" in keyword.lower():
-                print(f"[{self.name}] Applying budget template")
+                logger.debug("[%s] Applying budget template", self.name)
                 self.create_budget_template(sh)
                 type_ = "Tracker"
             else:
-                print(f"[{self.name}] Applying generic template")
+                logger.debug("[%s] Applying generic template", self.name)
                 self.create_generic_template(sh)
                 type_ = "Generic"
 
             # Share the sheet
-            print(f"[{self.name}] Sharing sheet publicly")
-            sh.share(None, perm_type='anyone', role='reader')
-            link = sh.url
-            print(f"[{self.name}] Sheet URL: {link}")
+            logger.debug("[%s] Sharing sheet publicly", self.name)
+            self.share_publicly(sh)
+            link = SPREADSHEET_URL.format(sh.id)
+            logger.info("[%s] Sheet URL: %s", self.name, link)
 
             # Log success
             product_data = {
@@ -49,31 +90,38 @@ class CreationAgent:
             }
             log_product(product_data)
             log_activity(self.name, "Success", f"Created {sheet_name}")
-            print(f"[{self.name}] ✅ Product creation complete!")
+            logger.info("[%s] ✅ Product creation complete!", self.name)
             return link
 
         except Exception as e:
             error_msg = f"Failed to create product '{keyword}': {str(e)}"
-            print(f"[{self.name}] ❌ {error_msg}")
+            logger.error("[%s] ❌ %s", self.name, error_msg)
             log_activity(self.name, "Error", error_msg)
             # Raise exception with details instead of returning None
             raise RuntimeError(error_msg) from e
+        finally:
+            flush_logs()
+
+    def share_publicly(self, sh):
+        """Grants anyone-with-the-link read access."""
+        # The agent is shared across threads; the Drive service is per thread
+        get_drive_service().permissions().create(
+            fileId=sh.id,
+            body={"type": "anyone", "role": "reader"},
+            fields="id"
+        ).execute()
 
     def create_planner_template(self, sh):
         """Creates a Daily Planner layout."""
         ws = sh.sheet1
         ws.update_title("Daily Planner")
         
-        # Header
-        ws.update("A1:B1", [["Daily Planner", "Date: ___________"]])
-        ws.format("A1:B1", {"textFormat": {"bold": True, "fontSize": 14}})
+        # Header + time slots, written in a single values request; RAW keeps
+        # the "6:00" slot labels as text rather than parsed times
+        ws.batch_update(PLANNER_VALUES, value_input_option="RAW")
         
-        # Time slots
-        times = [[f"{h}:00"] for h in range(6, 22)]
-        ws.update("A3", [["Time", "Task", "Notes"]] + [t + ["", ""] for t in times])
-        
-        # Formatting
-        ws.format("A3:C3", {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}})
+        # Formatting, applied in a single batchUpdate request
+        ws.batch_format(PLANNER_FORMATS)
         # Set column widths
         # set_column_width is not directly available in gspread on worksheet object in older versions, 
         # but newer versions might support it. Safest is generic update or just raw data.
@@ -84,17 +132,10 @@ class CreationAgent:
         ws = sh.sheet1
         ws.update_title("Budget Tracker")
         
-        ws.update("A1", [["Monthly Budget Tracker"]])
-        ws.format("A1", {"textFormat": {"bold": True, "fontSize": 14}})
-        
-        ws.update("A3:B3", [["Income Source", "Amount"]])
-        ws.update("A4", [["Salary", 0], ["Side Hustle", 0], ["Total", "=SUM(B4:B5)"]])
-        
-        ws.update("D3:G3", [["Expense Category", "Planned", "Actual", "Difference"]])
-        ws.update("D4", [["Rent", 1000, 1000, "=E4-F4"], ["Groceries", 300, 0, "=E5-F5"]])
+        # All values in one request; USER_ENTERED so the formulas are evaluated
+        ws.batch_update(BUDGET_VALUES, value_input_option="USER_ENTERED")
 
-        ws.format("A3:B3", {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.95, "blue": 0.9}})
-        ws.format("D3:G3", {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.95, "green": 0.9, "blue": 0.9}})
+        ws.batch_format(BUDGET_FORMATS)
 
     def create_generic_template(self, sh):
         """Creates a generic template."""
@@ -104,5 +145,6 @@ class CreationAgent:
 
 if __name__ == "__main__":
     # Test
+    logging.basicConfig(level=logging.INFO)
     agent = CreationAgent()
     agent.run({"keyword": "Test Planner", "platform": "Debug"})
@@ -4,14 +4,42 @@ Publishing Agent
 Publishes products to Pinterest for marketing automation.
 Users manually upload products to their shop and the app downloads the created files.
 """
-from app.utils.google_sheets import get_sheet, log_activity
+import logging
+
+from gspread.utils import rowcol_to_a1
+from app.utils.google_sheets import get_sheet, get_worksheet, log_activity, flush_logs
 from app.utils.pinterest_api import create_pin, get_pin_url
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Pin description body, formatted per product with name, type and hashtag
+PIN_DESCRIPTION_TEMPLATE = """🎯 {name}
+
+Get organized with this stunning {type} template!
+
+✨ Features:
+• Clean, professional design
+• Easy to customize
+• Digital download
+
+📎 Click the link to get yours!
+
+#planner #productivity #organization #digitalplanner #{tag}"""
+
 
 class PublishingAgent:
+    # 1-based column positions in the Products tab
+    # (Timestamp, Product Name, Type, Link, Status)
+    COL_TIMESTAMP = 1
+    COL_NAME = 2
+    COL_TYPE = 3
+    COL_LINK = 4
+    COL_STATUS = 5
+
     def __init__(self):
         self.name = "Publishing Agent"
+        self._pinterest_enabled = bool(Config.PINTEREST_ACCESS_TOKEN)
 
     def run(self, platform="pinterest"):
         """
@@ -23,78 +51,84 @@ class PublishingAgent:
         Returns:
             Dictionary with publish results.
         """
-        log_activity(self.name, "Start", f"Publishing to Pinterest")
+        try:
+            log_activity(self.name, "Start", f"Publishing to Pinterest")
         
-        # Get unpublished product from sheet
-        product = self.get_unpublished_product()
+            # Get unpublished product from sheet (plus the worksheet it lives in)
+            product, ws = self.get_unpublished_product()
         
-        if not product:
-            log_activity(self.name, "Warning", "No unpublished products found")
-            return {"success": False, "message": "No unpublished products found"}
+            if not product:
+                log_activity(self.name, "Warning", "No unpublished products found")
+                return {"success": False, "message": "No unpublished products found"}
         
-        results = {
-            "product_name": product["name"],
-            "pinterest": None
-        }
+            results = {
+                "product_name": product["name"],
+                "pinterest": None
+            }
         
-        # Publish to Pinterest
-        pinterest_result = self.publish_to_pinterest(product)
-        results["pinterest"] = pinterest_result
+            # Publish to Pinterest
+            pinterest_result = self.publish_to_pinterest(product)
+            results["pinterest"] = pinterest_result
         
-        # Update product status in sheet
-        self.update_product_status(product, results)
+            # Update product status in sheet
+            self.update_product_status(ws, product, results)
         
-        log_activity(self.name, "Complete", f"Published {product['name']} to Pinterest")
-        return results
+            log_activity(self.name, "Complete", f"Published {product['name']} to Pinterest")
+            return results
+        finally:
+            flush_logs()
 
     def get_unpublished_product(self):
-        """Get the most recent product with status 'Created'."""
+        """
+        Get the most recent product with status 'Created'.
+        
+        Returns:
+            Tuple of (product dict or None, Products worksheet or None). The
+            worksheet is handed back so the status update can reuse it.
+        """
         sheet = get_sheet()
         if not sheet:
-            return None
+            return None, None
         
+        ws = None
         try:
-            ws = sheet.worksheet("Products")
-            records = ws.get_all_records()
+            ws = get_worksheet("Products")
+            # Only the Status column is transferred to locate the row
+            status_col = ws.col_values(self.COL_STATUS)
             
-            # Find products with status "Created"
-            for record in reversed(records):  # Most recent first
-                if record.get("Status") == "Created":
+            # Find the most recent product with status "Created" (row 1 is the header)
+            for i in range(len(status_col) - 1, 0, -1):
+                if status_col[i] == "Created":
+                    row = i + 1
+                    values = ws.batch_get([f"A{row}:E{row}"])[0]
+                    record = list(values[0]) if values else []
+                    record += [""] * (self.COL_STATUS - len(record))
                     return {
-                        "name": record.get("Product Name"),
-                        "type": record.get("Type"),
-                        "link": record.get("Link"),
-                        "timestamp": record.get("Timestamp"),
-                        "row": records.index(record) + 2  # +2 for header and 0-index
-                    }
-            return None
+                        "name": record[self.COL_NAME - 1],
+                        "type": record[self.COL_TYPE - 1],
+                        "link": record[self.COL_LINK - 1],
+                        "timestamp": record[self.COL_TIMESTAMP - 1],
+                        "row": row
+                    }, ws
+            return None, ws
         except Exception as e:
-            print(f"[Publishing] Error getting product: {e}")
-            return None
+            logger.error("[Publishing] Error getting product: %s", e)
+            return None, ws
 
     def publish_to_pinterest(self, product):
         """
         Create a pin on Pinterest.
         """
-        if not Config.PINTEREST_ACCESS_TOKEN:
+        if not self._pinterest_enabled:
             return {"success": False, "error": "Pinterest not authenticated"}
         
         try:
             title = product['name']
-            description = f"""
-🎯 {product['name']}
-
-Get organized with this stunning {product['type']} template!
-
-✨ Features:
-• Clean, professional design
-• Easy to customize
-• Digital download
-
-📎 Click the link to get yours!
-
-#planner #productivity #organization #digitalplanner #{product['type'].lower().replace(' ', '')}
-            """.strip()
+            description = PIN_DESCRIPTION_TEMPLATE.format(
+                name=product['name'],
+                type=product['type'],
+                tag=product['type'].lower().replace(' ', '')
+            )
             
             pin_id = create_pin(
                 title=title,
@@ -115,15 +149,9 @@ Get organized with this stunning {product['type']} template!
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def update_product_status(self, product, results):
-        """Update the product status in the Google Sheet."""
-        sheet = get_sheet()
-        if not sheet:
-            return
-        
+    def update_product_status(self, ws, product, results):
+        """Update the product status in the Products worksheet."""
         try:
-            ws = sheet.worksheet("Products")
-            
             # Determine new status
             pinterest_ok = results.get("pinterest", {}).get("success", False)
             
@@ -132,14 +160,20 @@ Get organized with this stunning {product['type']} template!
             else:
                 new_status = "Publish Failed"
             
-            # Update status cell (column E, assuming Status is column 5)
-            ws.update_cell(product["row"], 5, new_status)
+            # Update status cell with a single values.update on its exact A1 range
+            # (keyword arguments keep this portable across gspread 5/6 argument order)
+            ws.update(
+                range_name=rowcol_to_a1(product["row"], self.COL_STATUS),
+                values=[[new_status]],
+                value_input_option="RAW"
+            )
             
         except Exception as e:
-            print(f"[Publishing] Error updating status: {e}")
+            logger.error("[Publishing] Error updating status: %s", e)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     agent = PublishingAgent()
     result = agent.run("pinterest")
     print(result)
@@ -3,18 +3,30 @@ Research Agent - Simplified for MVP
 Uses Google Trends ONLY for demand signals
 """
 
-import time
+import functools
+import logging
+import queue
 import random
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict
+from itertools import repeat
+from typing import List, Dict, TYPE_CHECKING
 
-from pytrends.request import TrendReq
+import numpy as np
 from app.utils.google_sheets import (
     create_research_run, 
     save_research_items, 
     complete_research_run, 
-    log_activity
+    log_activity,
+    flush_logs
 )
+from app.utils.local_db import cache_key, cache_get, cache_set
+
+if TYPE_CHECKING:
+    from pytrends.request import TrendReq
+
+logger = logging.getLogger(__name__)
 
 
 class ResearchAgent:
@@ -51,9 +63,50 @@ class ResearchAgent:
         "gratitude journal"
     ]
     
+    # Keyword pattern -> product type, in priority order
+    PRODUCT_TYPE_MAP = (
+        ("planner", "Planner"),
+        ("tracker", "Tracker"),
+        ("journal", "Journal"),
+        ("template", "Template"),
+        ("log", "Log"),
+        ("sticker", "Stickers"),
+        ("budget", "Budget Tool"),
+        ("habit", "Habit Tracker"),
+        ("meal", "Meal Planner"),
+        ("fitness", "Fitness Tool")
+    )
+    
+    # Single compiled alternation; the lookahead reports overlapping matches too
+    _PRODUCT_TYPE_RE = re.compile(
+        "(?=(" + "|".join(re.escape(pattern) for pattern, _ in PRODUCT_TYPE_MAP) + "))"
+    )
+    _PRODUCT_TYPE_RANK = {
+        pattern: (rank, ptype) for rank, (pattern, ptype) in enumerate(PRODUCT_TYPE_MAP)
+    }
+    
+    # Google Trends query parameters and how long a batch result stays fresh
+    TRENDS_TIMEFRAME = "today 3-m"  # 3-month window
+    TRENDS_GEO = "US"
+    TRENDS_CACHE_TTL = 6 * 60 * 60
+    
+    # Google scales each query to its own maximum, so every batch includes
+    # this keyword and is rescaled by its score to make batches comparable
+    TRENDS_ANCHOR = "daily planner"
+    
+    # Upper bound on concurrent Google Trends requests
+    MAX_CONCURRENT_BATCHES = 3
+    
+    # Idle TrendReq clients shared by all agents in the process
+    _trendreq_pool = queue.LifoQueue()
+    
     def __init__(self, keywords: List[str] = None):
         self.name = "Research Agent"
         self.keywords = keywords or self.DEFAULT_KEYWORDS
+        # Normalized (lowercase, stripped) form of each keyword, computed once
+        # and carried on every row as "keyword_norm" for downstream matching
+        self._keyword_norms = {kw: kw.lower().strip() for kw in [*self.keywords, self.TRENDS_ANCHOR]}
+        self._run_ts = None
     
     def run(self) -> List[Dict]:
         """
@@ -62,51 +115,140 @@ class ResearchAgent:
         Returns:
             List of trend data with run_id and enriched metrics
         """
-        print(f"\n[{self.name}] Starting research for {len(self.keywords)} keywords...")
-        
-        # Create research run
         try:
-            run_id = create_research_run()
-        except Exception as e:
-            log_activity(self.name, "Error", f"Failed to create run: {e}")
-            raise RuntimeError(f"Failed to create research run: {e}") from e
-        
-        log_activity(self.name, "Start", f"Run {run_id}: Researching {len(self.keywords)} keywords")
-        
-        # Get Google Trends data with time series
-        print(f"[{self.name}] Fetching Google Trends data...")
-        trends, time_series_data = self._get_google_trends()
+            logger.info("[%s] Starting research for %d keywords...", self.name, len(self.keywords))
+            
+            # Every row produced by this run shares one provenance timestamp
+            self._run_ts = datetime.now(timezone.utc).isoformat()
+        
+            # Create research run
+            try:
+                run_id = create_research_run()
+            except Exception as e:
+                log_activity(self.name, "Error", f"Failed to create run: {e}")
+                raise RuntimeError(f"Failed to create research run: {e}") from e
+        
+            log_activity(self.name, "Start", f"Run {run_id}: Researching {len(self.keywords)} keywords")
+        
+            # Get Google Trends data with time series
+            logger.info("[%s] Fetching Google Trends data...", self.name)
+            trends, time_series_data = self._get_google_trends()
+        
+            if not trends:
+                log_activity(self.name, "Warning", f"Run {run_id}: No trends found")
+                complete_research_run(run_id, 0)
+                return []
+        
+            # Deduplicate within run
+            deduped = self._deduplicate_keywords(trends)
+            logger.debug("[%s] Deduplication: %d → %d unique keywords", self.name, len(trends), len(deduped))
+        
+            # Enrich with velocity and categorization
+            enriched = self._enrich_trends(deduped, time_series_data)
+        
+            # Infer product types
+            enriched = self._infer_product_types(enriched)
+        
+            # Save to database
+            try:
+                save_research_items(run_id, enriched)
+                complete_research_run(run_id, len(enriched))
+            except Exception as e:
+                log_activity(self.name, "Error", f"Run {run_id}: Failed to save: {e}")
+                raise RuntimeError(f"Failed to save research results: {e}") from e
+        
+            log_activity(self.name, "Success", f"Run {run_id}: Found {len(enriched)} trends")
+            logger.info("[%s] ✅ Research complete: %d results saved", self.name, len(enriched))
+        
+            return enriched
+        finally:
+            self._run_ts = None
+            flush_logs()
+    
+    def _get_google_trends(self):
+        """Fetch trend data from Google Trends using pytrends.
         
-        if not trends:
-            log_activity(self.name, "Warning", f"Run {run_id}: No trends found")
-            complete_research_run(run_id, 0)
-            return []
+        Returns:
+            tuple: (trends list, time_series_data dict)
+        """
+        # Process in batches of 5 (pytrends limit): the anchor plus 4 keywords
+        anchor = self.TRENDS_ANCHOR
+        others = [kw for kw in self.keywords if kw != anchor]
+        batches = [[anchor] + others[i:i+4] for i in range(0, len(others), 4)] or [[anchor]]
+        timestamp = self._run_timestamp()
         
-        # Deduplicate within run
-        deduped = self._deduplicate_keywords(trends)
-        print(f"[{self.name}] Deduplication: {len(trends)} → {len(deduped)} unique keywords")
+        try:
+            # Batches are network-bound, so issue them concurrently; the pool
+            # size bounds how many requests are in flight against Google at once
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_BATCHES) as pool:
+                batch_outputs = list(pool.map(self._fetch_trends_batch, batches, repeat(timestamp)))
+            results, time_series_data = self._calibrate_batches(batch_outputs)
+                    
+        except Exception as e:
+            logger.warning("[%s] ⚠️  Pytrends failed: %s. Using fallback simulation.", self.name, e)
+            log_activity(self.name, "Warning", f"Pytrends error: {e}, using fallback")
+            results, time_series_data = self._simulate_google_trends()
         
-        # Enrich with velocity and categorization
-        enriched = self._enrich_trends(deduped, time_series_data)
+        return results, time_series_data
+    
+    def _calibrate_batches(self, batch_outputs: List[tuple]):
+        """Merge per-batch results onto the first batch's scale via the anchor.
         
-        # Infer product types
-        enriched = self._infer_product_types(enriched)
+        Each batch is multiplied by reference_anchor / batch_anchor, then
+        everything is scaled down if needed so scores stay within 0-100.
+        Batches without a real anchor score (simulated or zero) are merged
+        unscaled. The anchor row is kept once, and only if it was requested.
         
-        # Save to database
-        try:
-            save_research_items(run_id, enriched)
-            complete_research_run(run_id, len(enriched))
-        except Exception as e:
-            log_activity(self.name, "Error", f"Run {run_id}: Failed to save: {e}")
-            raise RuntimeError(f"Failed to save research results: {e}") from e
+        Returns:
+            tuple: (trends list, time_series_data dict)
+        """
+        anchor = self.TRENDS_ANCHOR
+        reference = None
+        scaled = []
+        for batch_results, batch_series in batch_outputs:
+            anchor_score = next(
+                (r["demand_score"] for r in batch_results
+                 if r["keyword"] == anchor and not r.get("simulated")),
+                0
+            )
+            if anchor_score > 0 and reference is None:
+                reference = anchor_score
+            factor = reference / anchor_score if anchor_score > 0 else 1.0
+            scaled.append((batch_results, batch_series, factor))
+        
+        top = max(
+            (r["demand_score"] * factor for rows, _, factor in scaled for r in rows),
+            default=0
+        )
+        if top > 100:
+            scaled = [(rows, series, factor * 100 / top) for rows, series, factor in scaled]
         
-        log_activity(self.name, "Success", f"Run {run_id}: Found {len(enriched)} trends")
-        print(f"[{self.name}] ✅ Research complete: {len(enriched)} results saved")
+        results = []
+        time_series_data = {}
+        seen_anchor = anchor not in self.keywords
+        for batch_results, batch_series, factor in scaled:
+            for r in batch_results:
+                if r["keyword"] == anchor:
+                    if seen_anchor:
+                        continue
+                    seen_anchor = True
+                results.append({**r, "demand_score": round(r["demand_score"] * factor, 2)})
+                time_series_data[r["keyword"]] = [v * factor for v in batch_series.get(r["keyword"], [])]
         
-        return enriched
+        return results, time_series_data
     
-    def _get_google_trends(self):
-        """Fetch trend data from Google Trends using pytrends.
+    def _run_timestamp(self) -> str:
+        """Timestamp of the current run, or now when called outside run()."""
+        return self._run_ts or datetime.now(timezone.utc).isoformat()
+    
+    def _fetch_trends_batch(self, batch: List[str], timestamp: str):
+        """Fetch one batch of up to 5 keywords.
+        
+        Each batch checks out its own TrendReq since pytrends keeps per-request
+        payload state on the instance. Errors from the request itself fall back
+        to the batch's last successful result, or to simulated scores if it has
+        never succeeded; a failure to create the client propagates so the
+        caller can switch to full simulation.
         
         Returns:
             tuple: (trends list, time_series_data dict)
@@ -114,122 +256,177 @@ class ResearchAgent:
         results = []
         time_series_data = {}
         
+        # Interest over a 3-month window barely moves within hours, so serve
+        # recent batches from the local cache instead of calling Google again
+        key = cache_key("gtrends", sorted(batch), self.TRENDS_TIMEFRAME, self.TRENDS_GEO)
+        # Never expires; served when Google errors or rate-limits the batch
+        last_good_key = cache_key("gtrends_last_good", sorted(batch), self.TRENDS_TIMEFRAME, self.TRENDS_GEO)
+        cached = cache_get(key)
+        if cached:
+            logger.debug("[%s]   Cache hit for batch: %s", self.name, batch)
+            cached_results, time_series_data = cached
+            return self._restamp(cached_results, timestamp), time_series_data
+        
+        pytrends = self._acquire_trendreq()
+        logger.debug("[%s]   Processing batch: %s", self.name, batch)
+        
         try:
-            pytrends = TrendReq(hl='en-US', tz=360)
+            pytrends.build_payload(
+                batch, 
+                cat=0, 
+                timeframe=self.TRENDS_TIMEFRAME,
+                geo=self.TRENDS_GEO, 
+                gprop=''
+            )
             
-            # Process in batches of 5 (pytrends limit)
-            for i in range(0, len(self.keywords), 5):
-                batch = self.keywords[i:i+5]
-                print(f"[{self.name}]   Processing batch {i//5 + 1}...")
-                
-                try:
-                    pytrends.build_payload(
-                        batch, 
-                        cat=0, 
-                        timeframe='today 3-m',  # 3-month window
-                        geo='US', 
-                        gprop=''
-                    )
-                    
-                    data = pytrends.interest_over_time()
-                    
-                    if not data.empty:
-                        means = data.mean()
-                        for keyword in batch:
-                            score = means.get(keyword, 0)
-                            if score > 0:
-                                results.append({
-                                    "keyword": keyword,
-                                    "demand_score": round(score, 2),
-                                    "timestamp": datetime.now(timezone.utc).isoformat()
-                                })
-                                # Store time series for velocity calculation
-                                time_series_data[keyword] = data[keyword].tolist() if keyword in data.columns else []
-                    
-                    # Rate limiting - be respectful
-                    time.sleep(random.uniform(1.5, 3.0))
-                    
-                except Exception as e:
-                    print(f"[{self.name}]   ⚠️  Batch error: {e}")
-                    # Use fallback for this batch
-                    for keyword in batch:
+            data = pytrends.interest_over_time()
+            
+            if not data.empty:
+                # One C-level reduction over the keyword columns only; the
+                # boolean isPartial column would otherwise be averaged in too
+                means = data.drop(columns=["isPartial"], errors="ignore").mean(numeric_only=True).to_dict()
+                for keyword in batch:
+                    score = means.get(keyword, 0.0)
+                    if score > 0:
                         results.append({
                             "keyword": keyword,
-                            "demand_score": random.randint(30, 70),
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "simulated": True
+                            "keyword_norm": self._keyword_norms[keyword],
+                            "demand_score": round(score, 2),
+                            "timestamp": timestamp
                         })
-                        time_series_data[keyword] = []
-                    
+                        # Store time series for velocity calculation
+                        time_series_data[keyword] = data[keyword].tolist() if keyword in data.columns else []
+            
+            cache_set(key, [results, time_series_data], ttl=self.TRENDS_CACHE_TTL)
+            cache_set(last_good_key, [results, time_series_data])
+            
         except Exception as e:
-            print(f"[{self.name}] ⚠️  Pytrends failed: {e}. Using fallback simulation.")
-            log_activity(self.name, "Warning", f"Pytrends error: {e}, using fallback")
-            results, time_series_data = self._simulate_google_trends()
+            logger.warning("[%s]   ⚠️  Batch error: %s", self.name, e)
+            # Prefer real (if stale) data over random scores in the rankings
+            last_good = cache_get(last_good_key)
+            if last_good:
+                logger.info("[%s]   Using last good result for batch: %s", self.name, batch)
+                last_results, time_series_data = last_good
+                return self._restamp(last_results, timestamp), time_series_data
+            
+            # Use fallback for this batch
+            results = []
+            time_series_data = {}
+            for keyword in batch:
+                results.append({
+                    "keyword": keyword,
+                    "keyword_norm": self._keyword_norms[keyword],
+                    "demand_score": random.randint(30, 70),
+                    "timestamp": timestamp,
+                    "simulated": True
+                })
+                time_series_data[keyword] = []
+        finally:
+            self._release_trendreq(pytrends)
         
         return results, time_series_data
     
+    def _restamp(self, rows: List[Dict], timestamp: str) -> List[Dict]:
+        """Copy cached rows with this run's timestamp and normalized keyword."""
+        return [
+            {**r, "keyword_norm": self._keyword_norms[r["keyword"]], "timestamp": timestamp}
+            for r in rows
+        ]
+    
+    @classmethod
+    def _acquire_trendreq(cls) -> "TrendReq":
+        """Check out an idle TrendReq, creating one only when none is free.
+        
+        Instances are kept across runs so the Google cookie handshake done in
+        the TrendReq constructor is paid once per pooled instance, not per batch.
+        """
+        try:
+            return cls._trendreq_pool.get_nowait()
+        except queue.Empty:
+            # Imported on first use: pytrends pulls in pandas, which the
+            # simulation path and plain imports of this module never need
+            from pytrends.request import TrendReq
+            # pytrends builds its own sessions, so use its built-in retry backoff
+            return TrendReq(hl='en-US', tz=360, retries=3, backoff_factor=0.5, timeout=(5, 15))
+    
+    @classmethod
+    def _release_trendreq(cls, pytrends: "TrendReq"):
+        """Return a TrendReq to the idle pool for the next batch or run."""
+        cls._trendreq_pool.put(pytrends)
+    
     def _simulate_google_trends(self):
         """Fallback simulation when pytrends fails.
         
         Returns:
             tuple: (trends list, time_series_data dict)
         """
-        print(f"[{self.name}] Using simulated demand data...")
-        results = []
-        time_series_data = {}
+        logger.info("[%s] Using simulated demand data...", self.name)
         
         high_demand = ["daily planner", "budget tracker", "habit tracker", "meal planner"]
+        timestamp = self._run_timestamp()
         
-        for keyword in self.keywords:
-            if keyword.lower() in high_demand:
-                score = random.randint(60, 95)
-            else:
-                score = random.randint(25, 65)
-            
-            results.append({
+        # Draw every score and series point in a few vectorized calls
+        rng = np.random.default_rng()
+        is_high = np.array([self._keyword_norms[kw] in high_demand for kw in self.keywords], dtype=bool)
+        scores = np.where(is_high, rng.integers(60, 96, size=is_high.size), rng.integers(25, 66, size=is_high.size))
+        
+        # Generate fake time series for simulation, 12 points within +/-20 of the score
+        low = np.maximum(0, scores - 20)[:, None]
+        high = np.minimum(100, scores + 20)[:, None]
+        series = rng.integers(low, high + 1, size=(is_high.size, 12))
+        
+        results = [
+            {
                 "keyword": keyword,
-                "demand_score": score,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "keyword_norm": self._keyword_norms[keyword],
+                "demand_score": int(score),
+                "timestamp": timestamp,
                 "simulated": True
-            })
-            # Generate fake time series for simulation
-            time_series_data[keyword] = [random.randint(max(0, score-20), min(100, score+20)) for _ in range(12)]
+            }
+            for keyword, score in zip(self.keywords, scores)
+        ]
+        time_series_data = dict(zip(self.keywords, series.tolist()))
         
         return results, time_series_data
     
     def _deduplicate_keywords(self, trends: List[Dict]) -> List[Dict]:
         """Deduplicate keywords within a single run."""
-        seen = set()
-        deduped = []
-        
+        # Keyed by normalized keyword; setdefault keeps the first occurrence
+        # and the dict preserves insertion order
+        unique = {}
         for trend in trends:
-            # Normalize: lowercase, strip
-            normalized = trend["keyword"].lower().strip()
-            
-            if normalized not in seen:
-                seen.add(normalized)
-                deduped.append(trend)
+            unique.setdefault(trend["keyword_norm"], trend)
         
-        return deduped
+        return list(unique.values())
     
     def _enrich_trends(self, trends: List[Dict], time_series_data: Dict) -> List[Dict]:
         """Enrich trends with velocity, categorization, confidence, and explanations."""
-        enriched = []
+        if not trends:
+            return []
         
-        for trend in trends:
-            keyword = trend["keyword"]
+        # Stack all series into one (keywords x samples) matrix so the metrics
+        # are computed in a handful of NumPy reductions instead of per keyword
+        ts, lengths = self._series_matrix(
+            [time_series_data.get(trend["keyword"], []) for trend in trends]
+        )
+        demand_scores = np.array([trend["demand_score"] for trend in trends], dtype=float)
+        
+        # Calculate velocity (growth rate)
+        velocities = self._calculate_velocity(ts, lengths)
+        
+        # Calculate confidence
+        confidences, confidence_scores = self._calculate_confidence(
+            ts, lengths, velocities, demand_scores
+        )
+        
+        enriched = []
+        for i, trend in enumerate(trends):
+            velocity = float(velocities[i])
             demand_score = trend["demand_score"]
-            time_series = time_series_data.get(keyword, [])
-            
-            # Calculate velocity (growth rate)
-            velocity = self._calculate_velocity(time_series, demand_score)
             
             # Categorize trend
             category = self._categorize_trend(velocity, demand_score)
             
-            # Calculate confidence
-            confidence, confidence_score = self._calculate_confidence(time_series, velocity, demand_score)
-            
             # Generate explanation
             explanation = self._generate_explanation(velocity, demand_score, category)
             
@@ -237,32 +434,44 @@ class ResearchAgent:
                 **trend,
                 "velocity": velocity,
                 "category": category,
-                "confidence": confidence,
-                "confidence_score": confidence_score,
+                "confidence": confidences[i],
+                "confidence_score": float(confidence_scores[i]),
                 "explanation": explanation
             })
         
         return enriched
     
-    def _calculate_velocity(self, time_series: List, current_score: float) -> float:
-        """Calculate growth velocity from time series data."""
-        if not time_series or len(time_series) < 2:
-            return 0.0
-        
+    @staticmethod
+    def _series_matrix(series: List[List]) -> tuple:
+        """Pack ragged time series into a zero-padded 2-D array plus per-row lengths."""
+        lengths = np.array([len(s) for s in series], dtype=int)
+        ts = np.zeros((len(series), lengths.max(initial=0)), dtype=float)
+        for i, s in enumerate(series):
+            ts[i, :len(s)] = s
+        return ts, lengths
+    
+    def _calculate_velocity(self, ts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Calculate growth velocity for every row of a padded time series matrix."""
         # Compare recent average to older average
-        mid_point = len(time_series) // 2
-        older_avg = sum(time_series[:mid_point]) / mid_point if mid_point > 0 else 0
-        recent_avg = sum(time_series[mid_point:]) / (len(time_series) - mid_point)
-        
-        if older_avg == 0:
-            # Growing from very low baseline
-            return 100.0 if recent_avg > 10 else 0.0
-        
-        # Calculate percentage growth
-        velocity = ((recent_avg - older_avg) / older_avg) * 100
-        return round(velocity, 1)
+        cols = np.arange(ts.shape[1])
+        mid = lengths // 2
+        older_mask = cols < mid[:, None]
+        recent_mask = (cols >= mid[:, None]) & (cols < lengths[:, None])
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            older_avg = np.where(older_mask, ts, 0).sum(axis=1) / mid
+            recent_avg = np.where(recent_mask, ts, 0).sum(axis=1) / (lengths - mid)
+            # Calculate percentage growth
+            growth = np.round((recent_avg - older_avg) / older_avg * 100, 1)
+        
+        # Growing from very low baseline when the older average is zero
+        velocity = np.where(older_avg == 0, np.where(recent_avg > 10, 100.0, 0.0), growth)
+        # Not enough data points
+        return np.where(lengths < 2, 0.0, velocity)
     
-    def _categorize_trend(self, velocity: float, demand_score: float) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _categorize_trend(velocity: float, demand_score: float) -> str:
         """Categorize trend as emerging, spiking, or stable."""
         # 📈 Emerging: Steady growth (30-60% velocity, low-medium baseline)
         if 30 <= velocity <= 60 and demand_score < 60:
@@ -275,45 +484,41 @@ class ResearchAgent:
         # 💤 Stable: Consistent interest (<30% velocity, any baseline)
         return "stable"
     
-    def _calculate_confidence(self, time_series: List, velocity: float, demand_score: float) -> tuple:
-        """Calculate confidence score based on consistency and other factors."""
-        score = 0.5  # Default medium
-        
-        # Factor 1: Consistency (low volatility)
-        if time_series and len(time_series) > 3:
-            avg = sum(time_series) / len(time_series)
-            variance = sum((x - avg) ** 2 for x in time_series) / len(time_series)
-            std_dev = variance ** 0.5
-            
-            if std_dev < 10:  # Low volatility
-                score += 0.2
-            elif std_dev > 30:  # High volatility
-                score -= 0.2
-        
-        # Factor 2: Absolute interest level
-        if demand_score > 60:
-            score += 0.15
-        elif demand_score < 20:
-            score -= 0.15
-        
-        # Factor 3: Velocity consistency
-        if 0 <= abs(velocity) <= 100:  # Reasonable velocity
-            score += 0.1
+    def _calculate_confidence(self, ts: np.ndarray, lengths: np.ndarray,
+                              velocity: np.ndarray, demand_score: np.ndarray) -> tuple:
+        """Calculate confidence scores based on consistency and other factors."""
+        # Factor 1: Consistency (low volatility), only for series with more than 3 points
+        valid = np.arange(ts.shape[1]) < lengths[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg = ts.sum(axis=1) / lengths
+            variance = np.where(valid, (ts - avg[:, None]) ** 2, 0).sum(axis=1) / lengths
+        std_dev = np.sqrt(variance)
+        has_series = lengths > 3
+        
+        # Each factor is a boolean mask weighted by its constant, so the whole
+        # score is one branch-free expression over all keywords:
+        #   default medium, +/- volatility, +/- absolute interest level
+        #   (Factor 2), + reasonable velocity (Factor 3)
+        score = (
+            0.5
+            + 0.2 * (has_series & (std_dev < 10))
+            - 0.2 * (has_series & (std_dev > 30))
+            + 0.15 * (demand_score > 60)
+            - 0.15 * (demand_score < 20)
+            + 0.1 * (np.abs(velocity) <= 100)
+        )
         
         # Clamp between 0 and 1
-        score = max(0.0, min(1.0, score))
+        score = np.round(np.clip(score, 0.0, 1.0), 2)
         
-        # Convert to label
-        if score >= 0.7:
-            label = "high"
-        elif score >= 0.4:
-            label = "medium"
-        else:
-            label = "low"
+        # Convert to labels
+        labels = np.where(score >= 0.7, "high", np.where(score >= 0.4, "medium", "low"))
         
-        return label, round(score, 2)
+        return labels.tolist(), score
     
-    def _generate_explanation(self, velocity: float, demand_score: float, category: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _generate_explanation(velocity: float, demand_score: float, category: str) -> str:
         """Generate 'Why this matters' explanation text."""
         # Describe velocity
         if velocity > 100:
@@ -343,29 +548,15 @@ class ResearchAgent:
     
     def _infer_product_types(self, trends: List[Dict]) -> List[Dict]:
         """Infer product type from keyword."""
-        product_type_map = {
-            "planner": "Planner",
-            "tracker": "Tracker",
-            "journal": "Journal",
-            "template": "Template",
-            "log": "Log",
-            "sticker": "Stickers",
-            "budget": "Budget Tool",
-            "habit": "Habit Tracker",
-            "meal": "Meal Planner",
-            "fitness": "Fitness Tool"
-        }
-        
         enriched = []
         for trend in trends:
-            keyword_lower = trend["keyword"].lower()
-            product_type = "Template"  # Default
-            
-            # Match keyword patterns
-            for pattern, ptype in product_type_map.items():
-                if pattern in keyword_lower:
-                    product_type = ptype
-                    break
+            # One scan of the keyword finds every pattern it contains; the
+            # earliest entry in PRODUCT_TYPE_MAP wins, as with a sequential check
+            matches = self._PRODUCT_TYPE_RE.findall(trend["keyword_norm"])
+            if matches:
+                product_type = min(self._PRODUCT_TYPE_RANK[m] for m in matches)[1]
+            else:
+                product_type = "Template"  # Default
             
             enriched.append({
                 **trend,
@@ -377,6 +568,7 @@ class ResearchAgent:
 
 if __name__ == "__main__":
     # Test the simplified research agent
+    logging.basicConfig(level=logging.INFO)
     agent = ResearchAgent()
     results = agent.run()
     
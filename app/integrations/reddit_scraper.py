@@ -1,18 +1,42 @@
 # Reddit Integration using PRAW
 # Official Reddit API - Free Tier
 
+import logging
 import os
 import time
-import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
-try:
-    import praw
-    PRAW_AVAILABLE = True
-except ImportError:
-    PRAW_AVAILABLE = False
-    print("Warning: praw not installed. Run: pip install praw")
+import numpy as np
+
+from app.utils.local_db import cache_key, cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Spaces request starts at least 1/rate seconds apart across threads.
+    
+    Callers reserve the next free slot under a lock, then sleep outside it,
+    so concurrent workers queue up without holding each other back.
+    """
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 
 class RedditResearcher:
@@ -46,14 +70,29 @@ class RedditResearcher:
         "budget", "habit", "goal", "schedule", "organizer"
     ]
     
+    # All buyer keywords compiled into one pattern, so each title is scanned once
+    _BUYER_INTENT_RE = re.compile("|".join(re.escape(bk) for bk in BUYER_KEYWORDS))
+    
+    # Concurrent searches and global request rate (Reddit allows ~100 QPM)
+    MAX_WORKERS = 8
+    REQUESTS_PER_SECOND = 1.5
+    
+    # Discussion volume shifts faster than search interest, so cache briefly
+    CACHE_TTL = 60 * 60
+    
     def __init__(self):
         """Initialize Reddit client using environment variables."""
         self.client = None
+        self._rate_limiter = RateLimiter(self.REQUESTS_PER_SECOND)
         self._init_client()
     
     def _init_client(self):
         """Initialize PRAW client if credentials available."""
-        if not PRAW_AVAILABLE:
+        # Imported here so the simulation path never pays for loading praw
+        try:
+            import praw
+        except ImportError:
+            logger.warning("praw not installed. Run: pip install praw")
             return
         
         # PRAW can work in read-only mode without user credentials
@@ -67,9 +106,9 @@ class RedditResearcher:
                     client_secret=client_secret,
                     user_agent="AIBusinessPartner/1.0 (Digital Product Research)"
                 )
-                print("Reddit API connected (authenticated)")
+                logger.info("Reddit API connected (authenticated)")
             except Exception as e:
-                print(f"Reddit auth failed: {e}")
+                logger.error("Reddit auth failed: %s", e)
         else:
             # Read-only mode (limited but works without credentials)
             try:
@@ -78,129 +117,177 @@ class RedditResearcher:
                     client_secret=None,
                     user_agent="AIBusinessPartner/1.0 (Digital Product Research)"
                 )
-                print("Reddit API connected (read-only mode)")
+                logger.info("Reddit API connected (read-only mode)")
             except Exception as e:
-                print(f"Reddit connection failed: {e}")
+                logger.error("Reddit connection failed: %s", e)
     
-    def search_trends(self, keywords: List[str], limit_per_sub: int = 10) -> List[Dict]:
+    def search_trends(self, keywords: List[str], limit_per_sub: int = 10,
+                      ts: Optional[str] = None) -> List[Dict]:
         """
         Search Reddit for trending discussions about digital products.
         
         Args:
             keywords: List of product keywords to search
             limit_per_sub: Max posts to analyze per subreddit
+            ts: ISO timestamp stamped on every result (defaults to now)
             
         Returns:
             List of normalized trend data
         """
+        # Computed once so all results of a search share the same timestamp
+        ts = ts or datetime.now(timezone.utc).isoformat()
+        
         if not self.client:
-            print("Reddit client not available, using simulated data")
-            return self._simulate_reddit_trends(keywords)
+            logger.warning("Reddit client not available, using simulated data")
+            return self._simulate_reddit_trends(keywords, ts)
         
         results = []
         
-        for keyword in keywords:
-            keyword_results = self._search_keyword(keyword, limit_per_sub)
-            results.extend(keyword_results)
-            
-            # Rate limiting - be respectful to Reddit API
-            time.sleep(random.uniform(0.5, 1.5))
+        # One multi-subreddit search per keyword; keywords run on a bounded
+        # pool, with a shared rate limiter (instead of per-call sleeps) to stay
+        # respectful to Reddit
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self._search_keyword, keyword, limit_per_sub, ts)
+                for keyword in keywords
+            ]
+            # Collect in submission order so output stays deterministic
+            for future in futures:
+                results.extend(future.result())
         
         return results
     
-    def _search_keyword(self, keyword: str, limit: int) -> List[Dict]:
-        """Search for a single keyword across target subreddits."""
-        results = []
+    def _search_keyword(self, keyword: str, limit: int, ts: str) -> List[Dict]:
+        """Search for a single keyword across target subreddits in one request."""
+        subreddits = self.SUBREDDITS[:5]  # Limit subreddits for MVP
+        key = cache_key("reddit", keyword, subreddits, limit)
+        keyword_norm = keyword.lower().strip()
+        cached = cache_get(key)
+        if cached is not None:
+            # Rows cached before keyword_norm was added get it here
+            return [{**r, "keyword_norm": keyword_norm, "timestamp": ts} for r in cached]
         
-        for subreddit_name in self.SUBREDDITS[:5]:  # Limit subreddits for MVP
-            try:
-                subreddit = self.client.subreddit(subreddit_name)
-                
-                # Search recent posts
-                posts = subreddit.search(
-                    keyword, 
-                    sort="relevance",
-                    time_filter="month",
-                    limit=limit
-                )
-                
-                discussion_count = 0
-                total_engagement = 0
-                buyer_intent_signals = 0
+        try:
+            self._rate_limiter.wait()
+            
+            # Reddit resolves "a+b+c" multireddits server-side, so one search
+            # covers every subreddit; posts are bucketed by subreddit below
+            posts = self.client.subreddit("+".join(subreddits)).search(
+                keyword, 
+                sort="relevance",
+                time_filter="month",
+                limit=limit * len(subreddits)
+            )
+            
+            stats = {name.lower(): [0, 0, 0] for name in subreddits}  # count, engagement, intent
+            open_buckets = len(stats)
+            for post in posts:
+                # Read the fields the listing already hydrated; attribute access
+                # on a PRAW object can trigger a lazy fetch for missing fields
+                data = post.__dict__
+                bucket = stats.get(data["subreddit"].display_name.lower())
+                if bucket is None or bucket[0] >= limit:
+                    continue
+                bucket[0] += 1
+                bucket[1] += data.get("score", 0) + data.get("num_comments", 0)
                 
-                for post in posts:
-                    discussion_count += 1
-                    total_engagement += post.score + post.num_comments
-                    
-                    # Check for buyer intent
-                    title_lower = post.title.lower()
-                    if any(bk in title_lower for bk in self.BUYER_KEYWORDS):
-                        buyer_intent_signals += 1
+                # Check for buyer intent
+                if self._BUYER_INTENT_RE.search(data.get("title", "").lower()):
+                    bucket[2] += 1
                 
-                if discussion_count > 0:
-                    # Calculate scores
-                    discussion_score = min(100, discussion_count * 10)
-                    engagement_score = min(100, total_engagement / discussion_count)
-                    buyer_intent_score = min(100, (buyer_intent_signals / discussion_count) * 100)
-                    
-                    results.append({
-                        "keyword": keyword,
-                        "source": "reddit",
-                        "subreddit": subreddit_name,
-                        "signal_type": "discussion_volume",
-                        "score": round((discussion_score * 0.4 + engagement_score * 0.4 + buyer_intent_score * 0.2), 2),
-                        "discussion_count": discussion_count,
-                        "avg_engagement": round(total_engagement / discussion_count, 1),
-                        "buyer_intent_signals": buyer_intent_signals,
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
-                    
-            except Exception as e:
-                print(f"Error searching r/{subreddit_name} for '{keyword}': {e}")
-                continue
+                # Stop paging through results once every subreddit is full
+                if bucket[0] == limit:
+                    open_buckets -= 1
+                    if not open_buckets:
+                        break
             
-            # Small delay between subreddit searches
-            time.sleep(random.uniform(0.3, 0.8))
+        except Exception as e:
+            logger.error("Error searching Reddit for '%s': %s", keyword, e)
+            return []
+        
+        active = [name for name in subreddits if stats[name.lower()][0]]
+        if not active:
+            cache_set(key, [], ttl=self.CACHE_TTL)
+            return []
+        
+        # Score every subreddit bucket at once: rows are
+        # (discussion count, total engagement, buyer intent signals)
+        counts, engagement, intent = np.array(
+            [stats[name.lower()] for name in active], dtype=float
+        ).T
+        avg_engagement = engagement / counts
+        
+        # Calculate scores (capped at 100 like the scalar min(100, x) it replaces;
+        # engagement is left unbounded below since post scores can be negative)
+        discussion_score = np.minimum(counts * 10, 100)
+        engagement_score = np.minimum(avg_engagement, 100)
+        buyer_intent_score = np.minimum(intent / counts * 100, 100)
+        scores = np.round(discussion_score * 0.4 + engagement_score * 0.4 + buyer_intent_score * 0.2, 2)
+        
+        results = [
+            {
+                "keyword": keyword,
+                "keyword_norm": keyword_norm,
+                "source": "reddit",
+                "subreddit": subreddit_name,
+                "signal_type": "discussion_volume",
+                "score": float(score),
+                "discussion_count": stats[subreddit_name.lower()][0],
+                "avg_engagement": round(float(avg), 1),
+                "buyer_intent_signals": stats[subreddit_name.lower()][2],
+                "timestamp": ts
+            }
+            for subreddit_name, score, avg in zip(active, scores, avg_engagement)
+        ]
         
+        cache_set(key, results, ttl=self.CACHE_TTL)
         return results
     
-    def _simulate_reddit_trends(self, keywords: List[str]) -> List[Dict]:
+    def _simulate_reddit_trends(self, keywords: List[str], ts: str) -> List[Dict]:
         """Simulate Reddit trends when API is not available."""
-        results = []
-        
         # Simulated engagement patterns
         high_engagement_keywords = ["habit tracker", "budget tracker", "daily planner"]
         medium_engagement = ["study planner", "meal planner", "fitness journal"]
         
-        for keyword in keywords:
-            if keyword.lower() in high_engagement_keywords:
-                base_score = random.randint(70, 95)
-                discussion_count = random.randint(15, 30)
-            elif keyword.lower() in medium_engagement:
-                base_score = random.randint(50, 75)
-                discussion_count = random.randint(8, 18)
-            else:
-                base_score = random.randint(25, 55)
-                discussion_count = random.randint(3, 12)
-            
-            results.append({
+        # Inclusive (low, high) ranges per tier: high, medium, other engagement
+        base_low, base_high = np.array([70, 50, 25]), np.array([95, 75, 55])
+        count_low, count_high = np.array([15, 8, 3]), np.array([30, 18, 12])
+        
+        keyword_norms = [keyword.lower().strip() for keyword in keywords]
+        tiers = np.array([
+            0 if kw_norm in high_engagement_keywords else 1 if kw_norm in medium_engagement else 2
+            for kw_norm in keyword_norms
+        ], dtype=int)
+        
+        # All random fields are drawn as whole arrays, one call each
+        rng = np.random.default_rng()
+        n = tiers.size
+        base_scores = rng.integers(base_low[tiers], base_high[tiers] + 1, size=n)
+        discussion_counts = rng.integers(count_low[tiers], count_high[tiers] + 1, size=n)
+        engagements = np.round(rng.uniform(10, 50, size=n), 1)
+        intents = rng.integers(1, 6, size=n)
+        
+        return [
+            {
                 "keyword": keyword,
+                "keyword_norm": keyword_norm,
                 "source": "reddit",
                 "subreddit": "simulated",
                 "signal_type": "discussion_volume",
-                "score": base_score,
-                "discussion_count": discussion_count,
-                "avg_engagement": round(random.uniform(10, 50), 1),
-                "buyer_intent_signals": random.randint(1, 5),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "score": int(base_score),
+                "discussion_count": int(discussion_count),
+                "avg_engagement": float(engagement),
+                "buyer_intent_signals": int(intent),
+                "timestamp": ts,
                 "simulated": True
-            })
-        
-        return results
-
+            }
+            for keyword, keyword_norm, base_score, discussion_count, engagement, intent
+            in zip(keywords, keyword_norms, base_scores, discussion_counts, engagements, intents)
+        ]
 
 if __name__ == "__main__":
     # Test the Reddit researcher
+    logging.basicConfig(level=logging.INFO)
     researcher = RedditResearcher()
     results = researcher.search_trends(["daily planner", "habit tracker"])
     
@@ -2,9 +2,30 @@
 # MVP Implementation - Uses heuristics and keyword patterns
 # No actual scraping - fully compliant with ToS
 
-import random
+import re
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict
+from itertools import accumulate
+from typing import List, Dict, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _final_scores(base, multiplier, modifier):
+    """Scale base scores, round half to even like round(), and cap at 100."""
+    return np.minimum(100, np.rint(base * multiplier * modifier)).astype(np.int64)
+
+
+if NUMBA_AVAILABLE:
+    # Optional: compiled to native code on first use (cached on disk)
+    _final_scores = njit(cache=True)(_final_scores)
 
 
 class SimulatedTrendSource:
@@ -55,11 +76,57 @@ class SimulatedTrendSource:
         "wellness": 70,
     }
     
+    # Product type and aesthetic terms, each scanned in a single regex pass
+    _TEMPLATE_RE = re.compile("template|printable|spreadsheet")
+    _TRACKER_RE = re.compile("tracker|planner|journal")
+    _AESTHETIC_RE = re.compile("minimalist|aesthetic|cute|boho|modern|pastel")
+    
+    # Table entries ordered most specific (longest) first, ties in table
+    # order; when several entries overlap a keyword, the earliest one wins
+    _ETSY_HOT_LIST = tuple(sorted(ETSY_HOT_KEYWORDS, key=len, reverse=True))
+    _PINTEREST_CATEGORY_LIST = tuple(sorted(PINTEREST_CATEGORIES, key=len, reverse=True))
+    _ETSY_HOT_RANK = {kw: rank for rank, kw in enumerate(_ETSY_HOT_LIST)}
+    _PINTEREST_CATEGORY_RANK = {c: rank for rank, c in enumerate(_PINTEREST_CATEGORY_LIST)}
+    
+    # Lookahead alternations report every (possibly overlapping) term found,
+    # preferring the longer entry where two start at the same position
+    _ETSY_HOT_RE = re.compile(
+        "(?=(" + "|".join(re.escape(kw) for kw in _ETSY_HOT_LIST) + "))"
+    )
+    _PINTEREST_CATEGORY_RE = re.compile(
+        "(?=(" + "|".join(re.escape(c) for c in _PINTEREST_CATEGORY_LIST) + "))"
+    )
+    
+    # Hot keywords joined into one string, so "keyword is part of a hot
+    # keyword" is one substring search whose first hit is the most specific
+    # entry; offsets map a hit back to its entry
+    _ETSY_HOT_JOINED = "\n".join(_ETSY_HOT_LIST)
+    _ETSY_HOT_OFFSETS = list(accumulate((len(kw) + 1 for kw in _ETSY_HOT_LIST[:-1]), initial=0))
+    
     def __init__(self):
         self.current_month = datetime.now().month
         self.seasonal_boost = self.SEASONAL_PATTERNS.get(self.current_month, [])
+        # Never matches when the month has no seasonal terms
+        self._seasonal_re = re.compile(
+            "|".join(re.escape(kw) for kw in self.seasonal_boost) or "(?!)"
+        )
+        # One independent Generator per source: Generators are not thread-safe
+        # and the sources may run concurrently in get_combined_simulation
+        self._etsy_rng, self._pinterest_rng = (
+            np.random.default_rng(seed) for seed in np.random.SeedSequence().spawn(2)
+        )
+    
+    def _etsy_hot_score(self, kw_lower: str) -> int:
+        """Score of the most specific hot keyword overlapping kw_lower, else 0."""
+        ranks = [self._ETSY_HOT_RANK[m] for m in self._ETSY_HOT_RE.findall(kw_lower)]
+        pos = self._ETSY_HOT_JOINED.find(kw_lower)
+        if pos >= 0:
+            ranks.append(bisect_right(self._ETSY_HOT_OFFSETS, pos) - 1)
+        if not ranks:
+            return 0
+        return self.ETSY_HOT_KEYWORDS[self._ETSY_HOT_LIST[min(ranks)]]
     
-    def get_etsy_trends(self, keywords: List[str]) -> List[Dict]:
+    def get_etsy_trends(self, keywords: List[str], kw_lowers: Optional[List[str]] = None) -> List[Dict]:
         """
         Simulate Etsy buyer intent signals.
         
@@ -67,51 +134,46 @@ class SimulatedTrendSource:
         - Keyword match to known high-converters
         - Seasonal relevance
         - Product type modifiers
+        
+        kw_lowers may pass in already-lowercased keywords to skip that step.
         """
-        results = []
+        # Pattern matching is per keyword; all score arithmetic below runs
+        # as NumPy array operations over the whole batch
+        if kw_lowers is None:
+            kw_lowers = [keyword.lower() for keyword in keywords]
+        n = len(kw_lowers)
         
-        for keyword in keywords:
-            kw_lower = keyword.lower()
-            
-            # Base score from known hot keywords
-            base_score = 0
-            for hot_kw, score in self.ETSY_HOT_KEYWORDS.items():
-                if hot_kw in kw_lower or kw_lower in hot_kw:
-                    base_score = max(base_score, score)
-                    break
-            
-            if base_score == 0:
-                base_score = random.randint(30, 60)
-            
-            # Seasonal boost
-            seasonal_multiplier = 1.0
-            for seasonal_kw in self.seasonal_boost:
-                if seasonal_kw in kw_lower:
-                    seasonal_multiplier = 1.2
-                    break
-            
-            # Product type modifiers (templates sell well)
-            type_modifier = 1.0
-            if any(t in kw_lower for t in ["template", "printable", "spreadsheet"]):
-                type_modifier = 1.15
-            elif any(t in kw_lower for t in ["tracker", "planner", "journal"]):
-                type_modifier = 1.1
-            
-            final_score = min(100, round(base_score * seasonal_multiplier * type_modifier))
-            
-            results.append({
+        # Base score from known hot keywords
+        hot_scores = np.array([self._etsy_hot_score(kw) for kw in kw_lowers], dtype=float)
+        base_scores = np.where(hot_scores == 0, self._etsy_rng.integers(30, 61, size=n), hot_scores)
+        
+        # Seasonal boost
+        seasonal = np.array([bool(self._seasonal_re.search(kw)) for kw in kw_lowers], dtype=bool)
+        seasonal_multiplier = np.where(seasonal, 1.2, 1.0)
+        
+        # Product type modifiers (templates sell well)
+        type_modifier = np.array([
+            1.15 if self._TEMPLATE_RE.search(kw) else 1.1 if self._TRACKER_RE.search(kw) else 1.0
+            for kw in kw_lowers
+        ], dtype=float)
+        
+        final_scores = _final_scores(base_scores, seasonal_multiplier, type_modifier)
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        return [
+            {
                 "keyword": keyword,
                 "source": "simulated_etsy",
                 "signal_type": "buyer_intent",
-                "score": final_score,
-                "seasonal_boost": seasonal_multiplier > 1.0,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "score": int(final_score),
+                "seasonal_boost": bool(boosted),
+                "timestamp": timestamp,
                 "notes": "Simulated based on Etsy market patterns"
-            })
-        
-        return results
+            }
+            for keyword, final_score, boosted in zip(keywords, final_scores, seasonal)
+        ]
     
-    def get_pinterest_trends(self, keywords: List[str]) -> List[Dict]:
+    def get_pinterest_trends(self, keywords: List[str], kw_lowers: Optional[List[str]] = None) -> List[Dict]:
         """
         Simulate Pinterest trend signals.
         
@@ -119,56 +181,58 @@ class SimulatedTrendSource:
         - Category alignment
         - Aesthetic/visual keywords
         - Seasonal relevance
+        
+        kw_lowers may pass in already-lowercased keywords to skip that step.
         """
-        results = []
+        if kw_lowers is None:
+            kw_lowers = [keyword.lower() for keyword in keywords]
+        n = len(kw_lowers)
         
-        for keyword in keywords:
-            kw_lower = keyword.lower()
-            
-            # Base score from category match
-            base_score = 0
-            matched_category = None
-            for category, score in self.PINTEREST_CATEGORIES.items():
-                if category in kw_lower:
-                    base_score = max(base_score, score)
-                    matched_category = category
-            
-            if base_score == 0:
-                base_score = random.randint(35, 65)
-            
-            # Aesthetic bonus (visual platforms favor these)
-            aesthetic_bonus = 0
-            aesthetic_terms = ["minimalist", "aesthetic", "cute", "boho", "modern", "pastel"]
-            if any(term in kw_lower for term in aesthetic_terms):
-                aesthetic_bonus = 15
-            
-            # Seasonal boost
-            seasonal_multiplier = 1.0
-            for seasonal_kw in self.seasonal_boost:
-                if seasonal_kw in kw_lower:
-                    seasonal_multiplier = 1.15
-                    break
-            
-            final_score = min(100, round((base_score + aesthetic_bonus) * seasonal_multiplier))
-            
-            results.append({
+        # Base score from the most specific matching category
+        category_scores = np.zeros(n)
+        matched_categories = [None] * n
+        for i, kw in enumerate(kw_lowers):
+            categories = self._PINTEREST_CATEGORY_RE.findall(kw)
+            if categories:
+                category = min(categories, key=self._PINTEREST_CATEGORY_RANK.__getitem__)
+                category_scores[i] = self.PINTEREST_CATEGORIES[category]
+                matched_categories[i] = category
+        base_scores = np.where(category_scores == 0, self._pinterest_rng.integers(35, 66, size=n), category_scores)
+        
+        # Aesthetic bonus (visual platforms favor these)
+        aesthetic_bonus = np.array([15 if self._AESTHETIC_RE.search(kw) else 0 for kw in kw_lowers], dtype=float)
+        
+        # Seasonal boost
+        seasonal = np.array([bool(self._seasonal_re.search(kw)) for kw in kw_lowers], dtype=bool)
+        seasonal_multiplier = np.where(seasonal, 1.15, 1.0)
+        
+        final_scores = _final_scores(base_scores + aesthetic_bonus, seasonal_multiplier, np.ones(n))
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        return [
+            {
                 "keyword": keyword,
                 "source": "simulated_pinterest",
                 "signal_type": "search_growth",
-                "score": final_score,
+                "score": int(final_score),
                 "matched_category": matched_category,
-                "seasonal_boost": seasonal_multiplier > 1.0,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "seasonal_boost": bool(boosted),
+                "timestamp": timestamp,
                 "notes": "Simulated based on Pinterest category patterns"
-            })
-        
-        return results
+            }
+            for keyword, final_score, matched_category, boosted
+            in zip(keywords, final_scores, matched_categories, seasonal)
+        ]
     
     def get_combined_simulation(self, keywords: List[str]) -> List[Dict]:
         """Get simulated trends from both Etsy and Pinterest."""
-        etsy = self.get_etsy_trends(keywords)
-        pinterest = self.get_pinterest_trends(keywords)
-        return etsy + pinterest
+        # Lowercase once for both sources
+        kw_lowers = [keyword.lower() for keyword in keywords]
+        # Sources are independent, so overlap them; results keep Etsy first
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            etsy = executor.submit(self.get_etsy_trends, keywords, kw_lowers)
+            pinterest = executor.submit(self.get_pinterest_trends, keywords, kw_lowers)
+            return etsy.result() + pinterest.result()
 
 
 if __name__ == "__main__":
@@ -1,31 +1,98 @@
 
+import atexit
 import gspread
+from gspread.utils import a1_to_rowcol
 import datetime
+import functools
+import logging
+import math
+import threading
+import time
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+from app.utils.http_session import mount_retries
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 # Define scopes
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive"
 ]
 
-def get_client():
-    """Authenticates and returns a gspread client."""
-    creds = Credentials.from_service_account_file(
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/{}"
+
+def get_credentials():
+    """Loads the service account credentials."""
+    return Credentials.from_service_account_file(
         Config.GOOGLE_APPLICATION_CREDENTIALS, scopes=SCOPES
     )
-    client = gspread.authorize(creds)
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Authenticates and returns a gspread client (cached per process)."""
+    creds = get_credentials()
+    # Pooled keep-alive session with retry backoff on 429/5xx
+    session = mount_retries(AuthorizedSession(creds))
+    client = gspread.Client(auth=creds, session=session)
     return client
 
+# googleapiclient services sit on httplib2, which isn't thread-safe, so
+# each thread builds its own; clear_client_cache bumps the generation to
+# have every thread rebuild
+_drive = threading.local()
+_drive_generation = 0
+
+def get_drive_service():
+    """Returns a Google Drive v3 API service for permission management (cached per thread)."""
+    if getattr(_drive, "generation", None) != _drive_generation:
+        _drive.service = build("drive", "v3", credentials=get_credentials(), cache_discovery=False)
+        _drive.generation = _drive_generation
+    return _drive.service
+
+@functools.lru_cache(maxsize=1)
+def _open_sheet():
+    """Opens the system memory spreadsheet once; failures are not cached."""
+    return get_client().open_by_key(Config.GOOGLE_SHEET_ID)
+
+@functools.lru_cache(maxsize=None)
+def get_worksheet(*titles):
+    """Returns the first existing tab among titles (cached per process).
+    
+    Later titles are fallbacks for older sheet layouts. Raises
+    gspread.WorksheetNotFound if none exist; failures are not cached.
+    """
+    sheet = _open_sheet()
+    for title in titles[:-1]:
+        try:
+            return sheet.worksheet(title)
+        except gspread.WorksheetNotFound:
+            pass
+    return sheet.worksheet(titles[-1])
+
+def _reset_on_api_error(e):
+    """Drops cached worksheet handles after an API error (e.g. a renamed or deleted tab)."""
+    if isinstance(e, gspread.exceptions.APIError):
+        get_worksheet.cache_clear()
+
+def clear_client_cache():
+    """Drops the cached client, Drive services, spreadsheet and worksheet handles."""
+    global _drive_generation
+    get_worksheet.cache_clear()
+    _open_sheet.cache_clear()
+    get_client.cache_clear()
+    _drive_generation += 1
+
 def get_sheet():
     """Returns the main system memory sheet."""
-    client = get_client()
     try:
-        sheet = client.open_by_key(Config.GOOGLE_SHEET_ID)
-        return sheet
+        return _open_sheet()
     except Exception as e:
-        print(f"Error opening sheet: {e}")
+        logger.error("Error opening sheet: %s", e)
+        # Force re-authorization on the next call (e.g. revoked or expired credentials)
+        clear_client_cache()
         return None
 
 def setup_tabs():
@@ -48,30 +115,158 @@ def setup_tabs():
     for tab_name, headers in required_tabs.items():
         if tab_name not in existing_tabs:
             try:
-                sheet.add_worksheet(title=tab_name, rows=100, cols=len(headers))
-                ws = sheet.worksheet(tab_name)
+                ws = sheet.add_worksheet(title=tab_name, rows=100, cols=len(headers))
                 ws.append_row(headers)
-                print(f"Created sheet: {tab_name}")
+                invalidate_read_cache()
+                # A fallback tab may be cached for a title that now exists
+                get_worksheet.cache_clear()
+                logger.info("Created sheet: %s", tab_name)
             except Exception as e:
-                print(f"Tab setup note for {tab_name}: {e}")
+                logger.warning("Tab setup note for %s: %s", tab_name, e)
+
+# Whole-tab reads are cached for READ_CACHE_TTL seconds so repeated dashboard
+# polls don't each cost a Sheets API request; every write through this
+# module clears the cache so readers never see stale data after a write
+READ_CACHE_TTL = 15.0
+
+_READ_CACHE = {}  # key -> (expires_at, values)
+_READ_CACHE_LOCK = threading.Lock()
+
+def invalidate_read_cache():
+    """Drops all cached tab reads."""
+    with _READ_CACHE_LOCK:
+        _READ_CACHE.clear()
+
+def _cached_read(key, fetch, ignore_cache=False):
+    """Returns fetch() through the read cache; ignore_cache forces a fresh read."""
+    now = time.monotonic()
+    if not ignore_cache:
+        with _READ_CACHE_LOCK:
+            hit = _READ_CACHE.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+    try:
+        values = fetch()
+    except Exception as e:
+        _reset_on_api_error(e)
+        raise
+    with _READ_CACHE_LOCK:
+        _READ_CACHE[key] = (now + READ_CACHE_TTL, values)
+    return values
+
+def get_tab_records(*titles, ignore_cache=False):
+    """Returns the rows of the first existing tab among titles as header-keyed dicts (cached briefly)."""
+    return _cached_read(
+        ("records", titles), lambda: get_worksheet(*titles).get_all_records(), ignore_cache
+    )
+
+# Last row holding data per worksheet id, learned from reads and append
+# responses; the grid's row_count can't be used as it counts trailing blank
+# rows and the cached worksheet handle never refreshes it
+_LAST_ROWS = {}
+_LAST_ROWS_LOCK = threading.Lock()
+
+def _appended_range(response):
+    """Returns (first_row, last_row) of a values.append response."""
+    # The API reports where the rows landed, e.g. "research_items!A12:F20"
+    cells = response["updates"]["updatedRange"].split("!")[-1].split(":")
+    return a1_to_rowcol(cells[0])[0], a1_to_rowcol(cells[-1])[0]
+
+def _note_last_row(ws, last_row):
+    with _LAST_ROWS_LOCK:
+        _LAST_ROWS[ws.id] = max(last_row, _LAST_ROWS.get(ws.id, 0))
+
+def _read_tail(titles, limit):
+    """Reads the last limit data rows (columns A:D) of the first existing tab, newest first."""
+    ws = get_worksheet(*titles)
+    with _LAST_ROWS_LOCK:
+        last_row = _LAST_ROWS.get(ws.id)
+    # Open-ended ranges, so rows appended elsewhere since are included; with
+    # the end unknown this is one read of the whole tab, which learns it
+    start = 2 if last_row is None else max(2, last_row - limit + 1)
+    rows = ws.get(f"A{start}:D")
+    if len(rows) < limit and start > 2:
+        # Rows were removed above; the known end is no longer valid
+        start = 2
+        rows = ws.get(f"A{start}:D")
+    # The API trims trailing blank rows, so the last row returned has data
+    with _LAST_ROWS_LOCK:
+        _LAST_ROWS[ws.id] = start + len(rows) - 1
+    # One reversed slice picks the tail newest first. Values come back
+    # unpadded (blank rows as [], trailing empty cells dropped), so pad each
+    # row to A:D and skip blank ones
+    return [row + [""] * (4 - len(row)) for row in rows[:-limit - 1:-1] if row]
+
+def get_tab_tail(*titles, limit=50, ignore_cache=False):
+    """Returns the last limit data rows of the first existing tab among titles, newest first (cached briefly)."""
+    return _cached_read(("tail", titles, limit), lambda: _read_tail(titles, limit), ignore_cache)
+
+# Activity rows are buffered in memory and written in one append_rows call,
+# at the latest LOG_FLUSH_INTERVAL seconds after the first buffered row, as
+# soon as LOG_FLUSH_THRESHOLD rows are pending, or at interpreter exit
+LOG_FLUSH_INTERVAL = 2.0
+LOG_FLUSH_THRESHOLD = 50
+
+_LOG_BUFFER = []
+_LOG_BUFFER_LOCK = threading.Lock()
+_flush_timer = None
+
+# Called with each activity entry as it is logged (e.g. to push it to open
+# dashboards); callbacks run on the logging thread and must not block
+_ACTIVITY_LISTENERS = []
+
+def add_activity_listener(callback):
+    """Registers callback(entry) for every logged activity."""
+    _ACTIVITY_LISTENERS.append(callback)
 
 def log_activity(agent_name, action, result):
-    """Logs an action to the Activity Log tab."""
+    """Queues an action for the Activity Log tab; written out by flush_logs()."""
+    global _flush_timer
+    timestamp = datetime.datetime.now().isoformat()
+    with _LOG_BUFFER_LOCK:
+        _LOG_BUFFER.append([timestamp, agent_name, action, result])
+        pending = len(_LOG_BUFFER)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(LOG_FLUSH_INTERVAL, flush_logs)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    logger.info("[%s] %s: %s", agent_name, action, result)
+    entry = {"timestamp": timestamp, "agent": agent_name, "action": action, "result": result}
+    for callback in _ACTIVITY_LISTENERS:
+        try:
+            callback(entry)
+        except Exception as e:
+            logger.warning("Activity listener failed: %s", e)
+    if pending >= LOG_FLUSH_THRESHOLD:
+        flush_logs()
+
+@atexit.register
+def flush_logs():
+    """Writes all buffered activity rows to the Activity Log tab in a single request."""
+    global _flush_timer
+    with _LOG_BUFFER_LOCK:
+        rows = _LOG_BUFFER[:]
+        _LOG_BUFFER.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()  # No-op when called from the timer itself
+            _flush_timer = None
+    if not rows:
+        return
+
     sheet = get_sheet()
     if not sheet:
         return
     
     try:
-        # Try user's tab name first, fallback to default
-        try:
-            ws = sheet.worksheet("daily_activity")
-        except:
-            ws = sheet.worksheet("Activity Log")
-        timestamp = datetime.datetime.now().isoformat()
-        ws.append_row([timestamp, agent_name, action, result])
-        print(f"[{agent_name}] {action}: {result}")
+        # User's tab name first, default as fallback
+        ws = get_worksheet("daily_activity", "Activity Log")
+        # RAW: agent messages are stored verbatim, never parsed as formulas
+        response = ws.append_rows(rows, value_input_option="RAW")
+        _note_last_row(ws, _appended_range(response)[1])
+        invalidate_read_cache()
     except Exception as e:
-        print(f"Error logging activity: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error logging activity: %s", e)
 
 def save_research(data):
     """Saves research data to the Research tab."""
@@ -80,32 +275,33 @@ def save_research(data):
         return
 
     try:
-        # Try user's tab name first, fallback to default
-        try:
-            ws = sheet.worksheet("research_logs")
-        except:
-            ws = sheet.worksheet("Research")
+        # User's tab name first, default as fallback
+        ws = get_worksheet("research_logs", "Research")
         timestamp = datetime.datetime.now().isoformat()
         # Expecting data to be a dict or list of dicts
-        if isinstance(data, list):
-            for item in data:
-                ws.append_row([
-                    timestamp,
-                    item.get("keyword", ""),
-                    item.get("platform", ""),
-                    item.get("signal", ""),
-                    item.get("notes", "")
-                ])
-        elif isinstance(data, dict):
-             ws.append_row([
+        if isinstance(data, dict):
+            items = [data]
+        elif isinstance(data, list):
+            items = data
+        else:
+            items = []
+        rows = [
+            [
                 timestamp,
-                data.get("keyword", ""),
-                data.get("platform", ""),
-                data.get("signal", ""),
-                data.get("notes", "")
-            ])
+                item.get("keyword", ""),
+                item.get("platform", ""),
+                item.get("signal", ""),
+                item.get("notes", "")
+            ]
+            for item in items
+        ]
+        # All rows in a single values.append request
+        if rows:
+            ws.append_rows(rows, value_input_option="RAW")
+            invalidate_read_cache()
     except Exception as e:
-        print(f"Error saving research: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error saving research: %s", e)
 
 def log_product(product_data):
     """Logs a new product to the Products tab."""
@@ -114,11 +310,8 @@ def log_product(product_data):
         return
 
     try:
-        # Try user's tab name first, fallback to default
-        try:
-            ws = sheet.worksheet("products")
-        except:
-            ws = sheet.worksheet("Products")
+        # User's tab name first, default as fallback
+        ws = get_worksheet("products", "Products")
         timestamp = datetime.datetime.now().isoformat()
         ws.append_row([
             timestamp,
@@ -127,8 +320,18 @@ def log_product(product_data):
             product_data.get("link", ""),
             product_data.get("status", "Created")
         ])
+        invalidate_read_cache()
     except Exception as e:
-        print(f"Error logging product: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error logging product: %s", e)
+
+def _to_float(value):
+    """Parses a cell value as a finite float; anything else counts as 0.0."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if math.isfinite(number) else 0.0
 
 def get_revenue():
     """Calculates total revenue."""
@@ -137,16 +340,40 @@ def get_revenue():
         return 0.0
 
     try:
-        ws = sheet.worksheet("revenue")
-        records = ws.get_all_records()
-        total = sum(float(r["Amount"]) for r in records if str(r["Amount"]).replace('.', '', 1).isdigit())
+        ws = get_worksheet("revenue")
+        # Only the Amount column (C), as raw numbers rather than display strings
+        amounts = ws.get("C2:C", value_render_option="UNFORMATTED_VALUE")
+        total = sum(_to_float(row[0]) for row in amounts if row)
         return total
     except Exception as e:
-        print(f"Error calculating revenue: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error calculating revenue: %s", e)
         return 0.0
 
 # ==================== RESEARCH RUN MANAGEMENT ====================
 
+# Sheet row of each live (run_id, keyword) item in research_items, filled in
+# as rows are written or read so single-item deletes skip the column scan
+_ITEM_ROWS = {}
+_ITEM_ROWS_LOCK = threading.Lock()
+
+def _register_item_rows(run_id, keywords, first_row):
+    """Records consecutive rows starting at first_row; the first row per key wins."""
+    with _ITEM_ROWS_LOCK:
+        for offset, keyword in enumerate(keywords):
+            _ITEM_ROWS.setdefault((run_id, keyword), first_row + offset)
+
+def _latest_run_id():
+    """Returns the run_id on the last filled row of research_runs, or None."""
+    run_ids = get_worksheet("research_runs").col_values(1)
+    return run_ids[-1] if len(run_ids) > 1 else None
+
+def _forget_run_items(run_id):
+    """Drops all cached item rows of a run."""
+    with _ITEM_ROWS_LOCK:
+        for key in [key for key in _ITEM_ROWS if key[0] == run_id]:
+            del _ITEM_ROWS[key]
+
 def create_research_run():
     """Creates a new research run and returns the run_id."""
     import uuid
@@ -155,13 +382,15 @@ def create_research_run():
         raise RuntimeError("Failed to connect to Google Sheets")
     
     try:
-        ws = sheet.worksheet("research_runs")
+        ws = get_worksheet("research_runs")
         run_id = f"run_{uuid.uuid4().hex[:8]}"
         timestamp = datetime.datetime.now().isoformat()
         ws.append_row([run_id, timestamp, 0, "running"])
-        print(f"Created research run: {run_id}")
+        invalidate_read_cache()
+        logger.info("Created research run: %s", run_id)
         return run_id
     except Exception as e:
+        _reset_on_api_error(e)
         raise RuntimeError(f"Failed to create research run: {e}") from e
 
 def complete_research_run(run_id, keywords_count):
@@ -171,16 +400,24 @@ def complete_research_run(run_id, keywords_count):
         return
     
     try:
-        ws = sheet.worksheet("research_runs")
-        all_values = ws.get_all_values()
-        for i, row in enumerate(all_values):
-            if row[0] == run_id:
-                ws.update_cell(i + 1, 3, keywords_count)  # Update keywords_count
-                ws.update_cell(i + 1, 4, "complete")  # Update status
-                print(f"Marked run {run_id} as complete with {keywords_count} keywords")
+        ws = get_worksheet("research_runs")
+        # Only the run_id column is read; the run being completed is usually
+        # the newest, so search from the bottom
+        run_ids = ws.col_values(1)
+        for i in range(len(run_ids) - 1, -1, -1):
+            if run_ids[i] == run_id:
+                # keywords_count and status are adjacent, so one range update
+                ws.update(
+                    range_name=f"C{i + 1}:D{i + 1}",
+                    values=[[keywords_count, "complete"]],
+                    value_input_option="USER_ENTERED"
+                )
+                invalidate_read_cache()
+                logger.info("Marked run %s as complete with %d keywords", run_id, keywords_count)
                 break
     except Exception as e:
-        print(f"Error completing research run: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error completing research run: %s", e)
 
 def save_research_items(run_id, items):
     """Saves research items for a given run."""
@@ -189,20 +426,30 @@ def save_research_items(run_id, items):
         raise RuntimeError("Failed to connect to Google Sheets")
     
     try:
-        ws = sheet.worksheet("research_items")
+        ws = get_worksheet("research_items")
         timestamp = datetime.datetime.now().isoformat()
         
-        for item in items:
-            ws.append_row([
+        rows = [
+            [
                 run_id,
                 item.get("keyword", ""),
                 item.get("demand_score", 0),
                 item.get("product_type", "Unknown"),
                 timestamp,
                 "FALSE"  # deleted
-            ])
-        print(f"Saved {len(items)} items to research_items")
+            ]
+            for item in items
+        ]
+        # All rows in a single values.append request
+        if rows:
+            response = ws.append_rows(rows, value_input_option="RAW")
+            first_row, last_row = _appended_range(response)
+            _note_last_row(ws, last_row)
+            _register_item_rows(run_id, [row[1] for row in rows], first_row)
+            invalidate_read_cache()
+        logger.info("Saved %d items to research_items", len(items))
     except Exception as e:
+        _reset_on_api_error(e)
         raise RuntimeError(f"Failed to save research items: {e}") from e
 
 def get_latest_research_run():
@@ -212,36 +459,42 @@ def get_latest_research_run():
         return {"results": []}
     
     try:
-        runs_ws = sheet.worksheet("research_runs")
-        runs = runs_ws.get_all_records()
+        # Run ids and the item columns in a single values.batchGet request
+        response = sheet.values_batch_get(["research_runs!A:A", "research_items!A:F"])
+        run_ids, all_items = (r.get("values", []) for r in response["valueRanges"])
         
-        if not runs:
+        # Get latest run (last row, below the header)
+        if len(run_ids) < 2 or not run_ids[-1]:
             return {"results": []}
+        run_id = run_ids[-1][0]
         
-        # Get latest run (last row)
-        latest_run = runs[-1]
-        run_id = latest_run["run_id"]
-        
-        # Get items for this run
-        items_ws = sheet.worksheet("research_items")
-        all_items = items_ws.get_all_records()
+        # Rows as (run_id, keyword, demand_score, product_type, timestamp, deleted)
+        # tuples; the API trims trailing empty cells, so pad to six columns
+        live_rows = []
+        for i, values in enumerate(all_items[1:], start=2):
+            item = (*values, *[""] * (6 - len(values)))
+            if item[0] == run_id and item[5] != "TRUE":
+                live_rows.append((i, item))
+        with _ITEM_ROWS_LOCK:
+            for row, item in live_rows:
+                _ITEM_ROWS.setdefault((run_id, item[1]), row)
         
         # Filter by run_id and not deleted
         run_items = [
             {
-                "keyword": item["keyword"],
-                "signal": float(item["demand_score"]),
-                "platform": item["product_type"],
+                "keyword": keyword,
+                "signal": float(demand_score),
+                "platform": product_type,
                 "notes": f"From run: {run_id}",
-                "timestamp": item["timestamp"]
+                "timestamp": timestamp
             }
-            for item in all_items
-            if item["run_id"] == run_id and item["deleted"] != "TRUE"
+            for _, (_, keyword, demand_score, product_type, timestamp, _) in live_rows
         ]
         
         return {"results": run_items, "run_id": run_id}
     except Exception as e:
-        print(f"Error getting latest research run: {e}")
+        _reset_on_api_error(e)
+        logger.error("Error getting latest research run: %s", e)
         return {"results": []}
 
 def delete_research_item(keyword):
@@ -251,27 +504,42 @@ def delete_research_item(keyword):
         raise RuntimeError("Failed to connect to Google Sheets")
     
     try:
-        ws = sheet.worksheet("research_items")
-        all_values = ws.get_all_values()
+        ws = get_worksheet("research_items")
         
         # Find and mark as deleted (from latest run)
-        runs_ws = sheet.worksheet("research_runs")
-        runs = runs_ws.get_all_records()
-        if not runs:
+        latest_run_id = _latest_run_id()
+        if not latest_run_id:
             raise RuntimeError("No research runs found")
         
-        latest_run_id = runs[-1]["run_id"]
+        # Known row: confirm it still holds the item (rows can be edited by
+        # hand) with a one-row read, then flag it
+        with _ITEM_ROWS_LOCK:
+            row = _ITEM_ROWS.pop((latest_run_id, keyword), None)
+        if row is not None:
+            cells = ws.get(f"A{row}:F{row}")
+            current = list(cells[0]) if cells else []
+            if current[:2] == [latest_run_id, keyword] and current[5:6] != ["TRUE"]:
+                ws.update_cell(row, 6, "TRUE")  # Mark deleted
+                invalidate_read_cache()
+                logger.info("Deleted item: %s", keyword)
+                return True
+        
+        # Only run_id, keyword (A:B) and deleted (F) are needed, in one request
+        id_cols, deleted_col = ws.batch_get(["A:B", "F:F"])
         
-        for i, row in enumerate(all_values):
+        for i, row in enumerate(id_cols):
             if i == 0:  # Skip header
                 continue
-            if row[0] == latest_run_id and row[1] == keyword and row[5] != "TRUE":
+            deleted = deleted_col[i][0] if i < len(deleted_col) and deleted_col[i] else ""
+            if row[:2] == [latest_run_id, keyword] and deleted != "TRUE":
                 ws.update_cell(i + 1, 6, "TRUE")  # Mark deleted
-                print(f"Deleted item: {keyword}")
+                invalidate_read_cache()
+                logger.info("Deleted item: %s", keyword)
                 return True
         
         raise RuntimeError(f"Item '{keyword}' not found in latest run")
     except Exception as e:
+        _reset_on_api_error(e)
         raise RuntimeError(f"Failed to delete research item: {e}") from e
 
 def delete_latest_research_run():
@@ -282,26 +550,42 @@ def delete_latest_research_run():
     
     try:
         # Get latest run_id
-        runs_ws = sheet.worksheet("research_runs")
-        runs = runs_ws.get_all_records()
-        if not runs:
+        latest_run_id = _latest_run_id()
+        if not latest_run_id:
             raise RuntimeError("No research runs found")
         
-        latest_run_id = runs[-1]["run_id"]
-        
         # Mark all items as deleted
-        items_ws = sheet.worksheet("research_items")
+        items_ws = get_worksheet("research_items")
         all_values = items_ws.get_all_values()
         
-        deleted_count = 0
-        for i, row in enumerate(all_values):
-            if i == 0:  # Skip header
-                continue
-            if row[0] == latest_run_id and row[5] != "TRUE":
-                items_ws.update_cell(i + 1, 6, "TRUE")
-                deleted_count += 1
+        rows = [
+            i + 1
+            for i, row in enumerate(all_values)
+            if i > 0 and row[0] == latest_run_id and row[5] != "TRUE"  # Skip header
+        ]
+        
+        # A run's items are appended together, so matching rows form a few
+        # contiguous blocks; each block becomes one F-column range
+        updates = []
+        for row in rows:
+            if updates and updates[-1][1] == row - 1:
+                updates[-1][1] = row
+            else:
+                updates.append([row, row])
+        if updates:
+            items_ws.batch_update(
+                [
+                    {"range": f"F{start}:F{end}", "values": [["TRUE"]] * (end - start + 1)}
+                    for start, end in updates
+                ],
+                value_input_option="USER_ENTERED"
+            )
+            invalidate_read_cache()
+        deleted_count = len(rows)
         
-        print(f"Deleted {deleted_count} items from run {latest_run_id}")
+        _forget_run_items(latest_run_id)
+        logger.info("Deleted %d items from run %s", deleted_count, latest_run_id)
         return deleted_count
     except Exception as e:
+        _reset_on_api_error(e)
         raise RuntimeError(f"Failed to delete latest research run: {e}") from e
@@ -0,0 +1,41 @@
+"""
+Shared HTTP Session
+Pooled keep-alive connections with retry backoff for outbound API calls.
+"""
+import functools
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient statuses worth retrying (rate limits and server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_adapter():
+    """Returns a pooled adapter that retries idempotent requests with backoff.
+
+    The final response is returned instead of raising once retries are
+    exhausted, so callers keep handling status codes themselves.
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False
+    )
+    return HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+
+
+def mount_retries(session):
+    """Mounts the pooled retry adapter on an existing session and returns it."""
+    adapter = build_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """Returns the process-wide requests.Session for plain HTTP APIs."""
+    return mount_retries(requests.Session())
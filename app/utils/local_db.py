@@ -3,362 +3,528 @@ Local SQLite Database for AI Business Partner
 Replaces Google Sheets for system memory (research, activity logs, products)
 """
 
+import atexit
 import sqlite3
 import datetime
+import json
+import logging
+import queue
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "business_partner.db"
 
+# Per-connection tuning: WAL appends need one fsync per checkpoint rather
+# than per commit under synchronous=NORMAL, and readers never block writers
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA busy_timeout=3000",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+)
+
+# Statements reused across calls; sqlite3 keeps their compiled form in the
+# per-connection statement cache, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+SQL_LOG_INSERT = "INSERT INTO activity_log (timestamp, agent, action, result) VALUES (?, ?, ?, ?)"
+SQL_ITEMS_INSERT = """INSERT INTO research_items 
+   (run_id, keyword, demand_score, velocity, category, confidence, 
+    confidence_score, explanation, product_type, timestamp, deleted) 
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+SQL_CACHE_GET = "SELECT value, expires_at FROM api_cache WHERE key = ?"
+SQL_CACHE_SET = "INSERT OR REPLACE INTO api_cache (key, value, expires_at) VALUES (?, ?, ?)"
+
+# One-time database file setup: the data directory is created and
+# journal_mode=WAL (persisted in the file) is set once per process
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def _prepare_database(conn):
+    """Runs the one-time setup on the first connection opened by the process."""
+    global _initialized
+    with _init_lock:
+        if not _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            _initialized = True
+
 
 def get_connection():
     """Get database connection."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    if not _initialized:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(DB_PATH), check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+    )
     conn.row_factory = sqlite3.Row  # Access columns by name
+    if not _initialized:
+        _prepare_database(conn)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
-def init_db():
-    """Initialize database with schema."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Research runs table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS research_runs (
-            run_id TEXT PRIMARY KEY,
-            timestamp TEXT NOT NULL,
-            keywords_count INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'running'
-        )
-    """)
-    
-    # Research items table with enriched trend data
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS research_items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id TEXT NOT NULL,
-            keyword TEXT NOT NULL,
-            demand_score REAL DEFAULT 0,
-            velocity REAL DEFAULT 0,
-            category TEXT DEFAULT 'stable',
-            confidence TEXT DEFAULT 'medium',
-            confidence_score REAL DEFAULT 0.5,
-            explanation TEXT,
-            product_type TEXT,
-            timestamp TEXT NOT NULL,
-            deleted INTEGER DEFAULT 0,
-            FOREIGN KEY (run_id) REFERENCES research_runs(run_id)
-        )
-    """)
-    
-    # Add new columns to existing tables (migration-safe)
-    try:
-        cursor.execute("ALTER TABLE research_items ADD COLUMN velocity REAL DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    try:
-        cursor.execute("ALTER TABLE research_items ADD COLUMN category TEXT DEFAULT 'stable'")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        cursor.execute("ALTER TABLE research_items ADD COLUMN confidence TEXT DEFAULT 'medium'")
-    except sqlite3.OperationalError:
-        pass
-    
+# Long-lived connections lent to one thread at a time, so helpers skip the
+# open/PRAGMA/close cycle on every call, and short-lived threads (the log
+# flush timer, per-run worker pools) reuse them instead of each opening one;
+# the pool only grows to the peak number of concurrent users
+_pool = queue.SimpleQueue()
+
+
+@contextmanager
+def conn_ctx():
+    """Lends a pooled connection for the block, rolling back if the block raises."""
     try:
-        cursor.execute("ALTER TABLE research_items ADD COLUMN confidence_score REAL DEFAULT 0.5")
-    except sqlite3.OperationalError:
-        pass
-    
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = get_connection()
     try:
-        cursor.execute("ALTER TABLE research_items ADD COLUMN explanation TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    # Activity log table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS activity_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            agent TEXT NOT NULL,
-            action TEXT NOT NULL,
-            result TEXT
-        )
-    """)
-    
-    # Products table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            keyword TEXT NOT NULL,
-            sheet_url TEXT,
-            timestamp TEXT NOT NULL,
-            status TEXT DEFAULT 'active'
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
-    print("✅ Local database initialized")
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _pool.put(conn)
+
+
+# ==================== TIMESTAMPS ====================
+# Timestamps are stored as integer Unix microseconds: cheaper to compare and
+# index than ISO strings, and only formatted when handed back to callers
+
+TIMESTAMP_TABLES = ("research_runs", "research_items", "activity_log", "products")
+
+
+def now_us() -> int:
+    """Current time as integer Unix microseconds."""
+    return time.time_ns() // 1000
+
+
+def us_to_iso(ts) -> str:
+    """Formats a stored timestamp as a local ISO-8601 string."""
+    return datetime.datetime.fromtimestamp(int(ts) / 1_000_000).isoformat()
+
+
+def _migrate_iso_timestamps(cursor):
+    """Converts ISO-string timestamps written by older versions to microseconds.
+    
+    Columns created as TEXT keep that affinity and store the values as digit
+    strings; they are fixed-width, so they still order chronologically.
+    """
+    for table in TIMESTAMP_TABLES:
+        rows = cursor.execute(
+            f"SELECT rowid, timestamp FROM {table} WHERE timestamp LIKE '%-%'"
+        ).fetchall()
+        if rows:
+            cursor.executemany(
+                f"UPDATE {table} SET timestamp = ? WHERE rowid = ?",
+                [
+                    (round(datetime.datetime.fromisoformat(ts).timestamp() * 1_000_000), rowid)
+                    for rowid, ts in rows
+                ]
+            )
+            logger.info("Migrated %d %s timestamps to microseconds", len(rows), table)
+
+
+def init_db():
+    """Initialize database with schema."""
+    with conn_ctx() as conn, conn:
+        cursor = conn.cursor()
+        
+        # Research runs table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS research_runs (
+                run_id TEXT PRIMARY KEY,
+                timestamp INTEGER NOT NULL,
+                keywords_count INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'running'
+            )
+        """)
+        
+        # Research items table with enriched trend data
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS research_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                demand_score REAL DEFAULT 0,
+                velocity REAL DEFAULT 0,
+                category TEXT DEFAULT 'stable',
+                confidence TEXT DEFAULT 'medium',
+                confidence_score REAL DEFAULT 0.5,
+                explanation TEXT,
+                product_type TEXT,
+                timestamp INTEGER NOT NULL,
+                deleted INTEGER DEFAULT 0,
+                FOREIGN KEY (run_id) REFERENCES research_runs(run_id)
+            )
+        """)
+        
+        # Add new columns to existing tables (migration-safe)
+        try:
+            cursor.execute("ALTER TABLE research_items ADD COLUMN velocity REAL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
+        try:
+            cursor.execute("ALTER TABLE research_items ADD COLUMN category TEXT DEFAULT 'stable'")
+        except sqlite3.OperationalError:
+            pass
+        
+        try:
+            cursor.execute("ALTER TABLE research_items ADD COLUMN confidence TEXT DEFAULT 'medium'")
+        except sqlite3.OperationalError:
+            pass
+        
+        try:
+            cursor.execute("ALTER TABLE research_items ADD COLUMN confidence_score REAL DEFAULT 0.5")
+        except sqlite3.OperationalError:
+            pass
+        
+        try:
+            cursor.execute("ALTER TABLE research_items ADD COLUMN explanation TEXT")
+        except sqlite3.OperationalError:
+            pass
+        
+        # Activity log table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS activity_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp INTEGER NOT NULL,
+                agent TEXT NOT NULL,
+                action TEXT NOT NULL,
+                result TEXT
+            )
+        """)
+        
+        # Products table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                keyword TEXT NOT NULL,
+                sheet_url TEXT,
+                timestamp INTEGER NOT NULL,
+                status TEXT DEFAULT 'active'
+            )
+        """)
+        
+        # Key/value cache for external API responses
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS api_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            )
+        """)
+        
+        _migrate_iso_timestamps(cursor)
+        
+        # Indexes for the latest-run lookups, item filters and recent-first logs
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_run ON research_items(run_id, deleted)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_keyword ON research_items(keyword)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_log_ts ON activity_log(timestamp DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_ts ON research_runs(timestamp DESC)")
+    logger.info("✅ Local database initialized")
 
 
 # ==================== RESEARCH RUN MANAGEMENT ====================
 
 def create_research_run() -> str:
     """Creates a new research run and returns the run_id."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     run_id = f"run_{uuid.uuid4().hex[:8]}"
-    timestamp = datetime.datetime.now().isoformat()
-    
-    cursor.execute(
-        "INSERT INTO research_runs (run_id, timestamp, keywords_count, status) VALUES (?, ?, ?, ?)",
-        (run_id, timestamp, 0, "running")
-    )
+    timestamp = now_us()
     
-    conn.commit()
-    conn.close()
+    with conn_ctx() as conn, conn:
+        conn.execute(
+            "INSERT INTO research_runs (run_id, timestamp, keywords_count, status) VALUES (?, ?, ?, ?)",
+            (run_id, timestamp, 0, "running")
+        )
     
-    print(f"Created research run: {run_id}")
+    logger.info("Created research run: %s", run_id)
     return run_id
 
 
 def complete_research_run(run_id: str, keywords_count: int):
     """Marks a research run as complete."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        "UPDATE research_runs SET keywords_count = ?, status = ? WHERE run_id = ?",
-        (keywords_count, "complete", run_id)
-    )
-    
-    conn.commit()
-    conn.close()
-    print(f"Marked run {run_id} as complete with {keywords_count} keywords")
+    with conn_ctx() as conn, conn:
+        conn.execute(
+            "UPDATE research_runs SET keywords_count = ?, status = ? WHERE run_id = ?",
+            (keywords_count, "complete", run_id)
+        )
+    logger.info("Marked run %s as complete with %d keywords", run_id, keywords_count)
 
 
 def save_research_items(run_id: str, items: List[Dict]):
     """Saves research items for a given run."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    timestamp = datetime.datetime.now().isoformat()
-    
-    for item in items:
-        cursor.execute(
-            """INSERT INTO research_items 
-               (run_id, keyword, demand_score, velocity, category, confidence, 
-                confidence_score, explanation, product_type, timestamp, deleted) 
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                run_id,
-                item.get("keyword", ""),
-                item.get("demand_score", 0),
-                item.get("velocity", 0),
-                item.get("category", "stable"),
-                item.get("confidence", "medium"),
-                item.get("confidence_score", 0.5),
-                item.get("explanation", ""),
-                item.get("product_type", "Unknown"),
-                timestamp,
-                0
-            )
+    timestamp = now_us()
+    
+    rows = [
+        (
+            run_id,
+            item.get("keyword", ""),
+            item.get("demand_score", 0),
+            item.get("velocity", 0),
+            item.get("category", "stable"),
+            item.get("confidence", "medium"),
+            item.get("confidence_score", 0.5),
+            item.get("explanation", ""),
+            item.get("product_type", "Unknown"),
+            timestamp,
+            0
         )
+        for item in items
+    ]
     
-    conn.commit()
-    conn.close()
-    print(f"Saved {len(items)} items to research_items")
+    # One statement and one transaction for the whole batch
+    with conn_ctx() as conn, conn:
+        conn.executemany(SQL_ITEMS_INSERT, rows)
+    logger.info("Saved %d items to research_items", len(items))
+
+
+# Subquery selecting the most recent run, inlined so each helper is one statement
+LATEST_RUN_ID_SQL = "SELECT run_id FROM research_runs ORDER BY timestamp DESC LIMIT 1"
 
 
 def get_latest_research_run() -> Dict:
     """Gets the latest research run with its enriched items."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Get latest run
-    cursor.execute(
-        "SELECT * FROM research_runs ORDER BY timestamp DESC LIMIT 1"
-    )
-    run = cursor.fetchone()
-    
-    if not run:
-        conn.close()
+    # LEFT JOIN keeps one all-NULL item row when the latest run has no live
+    # items, so "no runs" and "empty run" stay distinguishable
+    with conn_ctx() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None  # Plain tuples: unpacked positionally below
+        rows = cursor.execute(
+            f"""WITH latest AS ({LATEST_RUN_ID_SQL})
+               SELECT latest.run_id, i.keyword, i.demand_score, i.velocity, i.category,
+                      i.confidence, i.confidence_score, i.explanation, i.product_type,
+                      i.timestamp
+               FROM latest
+               LEFT JOIN research_items i ON i.run_id = latest.run_id AND i.deleted = 0"""
+        ).fetchall()
+    
+    if not rows:
         return {"results": []}
     
-    run_id = run["run_id"]
-    
-    # Get items for this run (not deleted) with all enriched fields
-    cursor.execute(
-        """SELECT keyword, demand_score, velocity, category, confidence, 
-                  confidence_score, explanation, product_type, timestamp 
-           FROM research_items 
-           WHERE run_id = ? AND deleted = 0""",
-        (run_id,)
-    )
-    
-    items = cursor.fetchall()
-    conn.close()
+    run_id = rows[0][0]
     
     results = [
         {
-            "keyword": item["keyword"],
-            "signal": float(item["demand_score"]),
-            "velocity": float(item["velocity"]) if item["velocity"] else 0,
-            "category": item["category"] or "stable",
-            "confidence": item["confidence"] or "medium",
-            "confidence_score": float(item["confidence_score"]) if item["confidence_score"] else 0.5,
-            "explanation": item["explanation"] or "",
-            "platform": item["product_type"],
-            "timestamp": item["timestamp"]
+            "keyword": keyword,
+            "signal": float(demand_score),
+            "velocity": float(velocity) if velocity else 0,
+            "category": category or "stable",
+            "confidence": confidence or "medium",
+            "confidence_score": float(confidence_score) if confidence_score else 0.5,
+            "explanation": explanation or "",
+            "platform": product_type,
+            "timestamp": us_to_iso(timestamp)
         }
-        for item in items
+        for (_, keyword, demand_score, velocity, category, confidence,
+             confidence_score, explanation, product_type, timestamp) in rows
+        if keyword is not None
     ]
     
     return {"results": results, "run_id": run_id}
 
 
+def _has_research_runs(conn) -> bool:
+    """True if at least one research run exists (used on error paths only)."""
+    return conn.execute("SELECT 1 FROM research_runs LIMIT 1").fetchone() is not None
+
+
 def delete_research_item(keyword: str):
     """Marks a research item as deleted."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Get latest run_id
-    cursor.execute(
-        "SELECT run_id FROM research_runs ORDER BY timestamp DESC LIMIT 1"
-    )
-    run = cursor.fetchone()
-    
-    if not run:
-        conn.close()
-        raise RuntimeError("No research runs found")
-    
-    run_id = run["run_id"]
-    
-    # Mark as deleted
-    cursor.execute(
-        "UPDATE research_items SET deleted = 1 WHERE run_id = ? AND keyword = ? AND deleted = 0",
-        (run_id, keyword)
-    )
-    
-    if cursor.rowcount == 0:
-        conn.close()
-        raise RuntimeError(f"Item '{keyword}' not found in latest run")
-    
-    conn.commit()
-    conn.close()
-    print(f"Deleted item: {keyword}")
+    with conn_ctx() as conn, conn:
+        cursor = conn.execute(
+            f"""UPDATE research_items SET deleted = 1
+               WHERE run_id = ({LATEST_RUN_ID_SQL}) AND keyword = ? AND deleted = 0""",
+            (keyword,)
+        )
+        
+        if cursor.rowcount == 0:
+            if not _has_research_runs(conn):
+                raise RuntimeError("No research runs found")
+            raise RuntimeError(f"Item '{keyword}' not found in latest run")
+    logger.info("Deleted item: %s", keyword)
 
 
 def delete_latest_research_run() -> int:
     """Marks all items in the latest research run as deleted."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Get latest run_id
-    cursor.execute(
-        "SELECT run_id FROM research_runs ORDER BY timestamp DESC LIMIT 1"
-    )
-    run = cursor.fetchone()
-    
-    if not run:
-        conn.close()
-        raise RuntimeError("No research runs found")
-    
-    run_id = run["run_id"]
-    
-    # Mark all items as deleted
-    cursor.execute(
-        "UPDATE research_items SET deleted = 1 WHERE run_id = ? AND deleted = 0",
-        (run_id,)
-    )
-    
-    deleted_count = cursor.rowcount
-    conn.commit()
-    conn.close()
+    with conn_ctx() as conn, conn:
+        cursor = conn.execute(
+            f"""UPDATE research_items SET deleted = 1
+               WHERE run_id = ({LATEST_RUN_ID_SQL}) AND deleted = 0"""
+        )
+        
+        deleted_count = cursor.rowcount
+        if deleted_count == 0 and not _has_research_runs(conn):
+            raise RuntimeError("No research runs found")
     
-    print(f"Deleted {deleted_count} items from run {run_id}")
+    logger.info("Deleted %d items from latest run", deleted_count)
     return deleted_count
 
 
 # ==================== ACTIVITY LOG ====================
 
+# Activity rows are buffered and written in one transaction per batch, so
+# callers never wait on a commit: at the latest LOG_FLUSH_INTERVAL seconds
+# after the first buffered row, once LOG_FLUSH_THRESHOLD rows are pending,
+# before activity is read back, or at interpreter exit
+LOG_FLUSH_INTERVAL = 0.5
+LOG_FLUSH_THRESHOLD = 64
+
+_LOG_BUFFER = []
+_LOG_BUFFER_LOCK = threading.Lock()
+_flush_timer = None
+
+# Called with each activity entry as it is logged (e.g. to push it to open
+# dashboards); callbacks run on the logging thread and must not block
+_ACTIVITY_LISTENERS = []
+
+
+def add_activity_listener(callback):
+    """Registers callback(entry) for every logged activity."""
+    _ACTIVITY_LISTENERS.append(callback)
+
+
 def log_activity(agent: str, action: str, result: str):
-    """Logs an activity to the local database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    timestamp = datetime.datetime.now().isoformat()
-    
-    cursor.execute(
-        "INSERT INTO activity_log (timestamp, agent, action, result) VALUES (?, ?, ?, ?)",
-        (timestamp, agent, action, result)
-    )
+    """Queues an activity for the local database; written out by flush_logs()."""
+    global _flush_timer
+    timestamp = now_us()
+    
+    with _LOG_BUFFER_LOCK:
+        _LOG_BUFFER.append((timestamp, agent, action, result))
+        pending = len(_LOG_BUFFER)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(LOG_FLUSH_INTERVAL, flush_logs)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    entry = {"timestamp": us_to_iso(timestamp), "agent": agent, "action": action, "result": result}
+    for callback in _ACTIVITY_LISTENERS:
+        try:
+            callback(entry)
+        except Exception as e:
+            logger.warning("Activity listener failed: %s", e)
+    if pending >= LOG_FLUSH_THRESHOLD:
+        flush_logs()
+
+
+@atexit.register
+def flush_logs():
+    """Writes all buffered activity rows in a single transaction."""
+    global _flush_timer
+    with _LOG_BUFFER_LOCK:
+        rows = _LOG_BUFFER[:]
+        _LOG_BUFFER.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()  # No-op when called from the timer itself
+            _flush_timer = None
+    if not rows:
+        return
     
-    conn.commit()
-    conn.close()
+    try:
+        with conn_ctx() as conn, conn:
+            conn.executemany(SQL_LOG_INSERT, rows)
+    except sqlite3.Error as e:
+        logger.error("Error writing %d activity rows: %s", len(rows), e)
 
 
 def get_activity_logs(limit: int = 100) -> List[Dict]:
     """Gets recent activity logs."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        "SELECT * FROM activity_log ORDER BY timestamp DESC LIMIT ?",
-        (limit,)
-    )
-    
-    logs = cursor.fetchall()
-    conn.close()
-    
-    return [dict(log) for log in logs]
+    flush_logs()
+    with conn_ctx() as conn:
+        logs = conn.execute(
+            "SELECT id, timestamp, agent, action, result FROM activity_log ORDER BY timestamp DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+    
+    return [{**dict(log), "timestamp": us_to_iso(log["timestamp"])} for log in logs]
+
+
+def get_last_activity() -> Optional[Dict]:
+    """Gets the most recent activity log entry, or None if there is none."""
+    flush_logs()
+    with conn_ctx() as conn:
+        log = conn.execute(
+            "SELECT timestamp, agent, action, result FROM activity_log ORDER BY timestamp DESC LIMIT 1"
+        ).fetchone()
+    
+    if not log:
+        return None
+    return {**dict(log), "timestamp": us_to_iso(log["timestamp"])}
 
 
 # ==================== PRODUCTS ====================
 
 def save_product(keyword: str, sheet_url: str, status: str = "active"):
     """Saves product metadata to local database."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    timestamp = now_us()
     
-    timestamp = datetime.datetime.now().isoformat()
-    
-    cursor.execute(
-        "INSERT INTO products (keyword, sheet_url, timestamp, status) VALUES (?, ?, ?, ?)",
-        (keyword, sheet_url, timestamp, status)
-    )
-    
-    conn.commit()
-    conn.close()
-    print(f"Saved product: {keyword}")
+    with conn_ctx() as conn, conn:
+        conn.execute(
+            "INSERT INTO products (keyword, sheet_url, timestamp, status) VALUES (?, ?, ?, ?)",
+            (keyword, sheet_url, timestamp, status)
+        )
+    logger.info("Saved product: %s", keyword)
 
 
 def get_all_products() -> List[Dict]:
     """Gets all products from local database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        "SELECT * FROM products ORDER BY timestamp DESC"
-    )
-    
-    products = cursor.fetchall()
-    conn.close()
+    with conn_ctx() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None  # Plain tuples: unpacked positionally below
+        products = cursor.execute(
+            "SELECT keyword, sheet_url, timestamp, status FROM products ORDER BY timestamp DESC"
+        ).fetchall()
     
     return [
         {
-            "name": p["keyword"],
-            "link": p["sheet_url"],
-            "timestamp": p["timestamp"],
-            "status": p["status"]
+            "name": keyword,
+            "link": sheet_url,
+            "timestamp": us_to_iso(timestamp),
+            "status": status
         }
-        for p in products
+        for keyword, sheet_url, timestamp, status in products
     ]
+
+
+# ==================== API CACHE ====================
+
+def cache_key(*parts) -> str:
+    """Builds a stable cache key from JSON-serializable parts."""
+    return json.dumps(parts, separators=(",", ":"))
+
+
+def cache_get(key: str):
+    """Returns the cached value for key, or None if missing or expired.
+    
+    Caching is best-effort: database errors are treated as a miss.
+    """
+    try:
+        with conn_ctx() as conn:
+            row = conn.execute(SQL_CACHE_GET, (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    
+    if not row:
+        return None
+    if row["expires_at"] is not None and row["expires_at"] < time.time():
+        return None
+    return json.loads(row["value"])
+
+
+def cache_set(key: str, value, ttl: Optional[float] = None):
+    """Stores a JSON-serializable value; ttl is in seconds, None never expires."""
+    expires_at = time.time() + ttl if ttl is not None else None
+    try:
+        with conn_ctx() as conn, conn:
+            conn.execute(SQL_CACHE_SET, (key, json.dumps(value), expires_at))
+    except sqlite3.Error as e:
+        logger.warning("Cache write skipped: %s", e)
@@ -3,15 +3,59 @@
 Pinterest API Utility Module
 Handles OAuth 2.0 authentication and pin creation for Pinterest API v5.
 """
-import requests
-import base64
+import logging
+import threading
+import time
 from urllib.parse import urlencode
+from app.utils.http_session import get_session
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 PINTEREST_AUTH_URL = "https://www.pinterest.com/oauth/"
 PINTEREST_TOKEN_URL = "https://api.pinterest.com/v5/oauth/token"
 PINTEREST_API_BASE = "https://api.pinterest.com/v5"
 
+# Refresh this many seconds before the access token actually expires
+TOKEN_EXPIRY_MARGIN = 60
+
+# Current tokens; expires_at is None while the expiry is unknown (e.g. a
+# token from .env), in which case the token is used as-is
+_TOKEN_CACHE = {
+    "access": Config.PINTEREST_ACCESS_TOKEN,
+    "refresh": Config.PINTEREST_REFRESH_TOKEN,
+    "expires_at": None,
+}
+# Reentrant: held across a refresh, which stores the new tokens itself
+_TOKEN_LOCK = threading.RLock()
+
+
+def _cache_tokens(tokens):
+    """Stores a token response; expiry comes from its expires_in seconds."""
+    expires_in = tokens.get("expires_in")
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE["access"] = tokens["access_token"]
+        _TOKEN_CACHE["refresh"] = tokens.get("refresh_token") or _TOKEN_CACHE["refresh"]
+        _TOKEN_CACHE["expires_at"] = (
+            time.time() + expires_in - TOKEN_EXPIRY_MARGIN if expires_in else None
+        )
+
+
+def get_access_token():
+    """
+    Returns a usable access token, refreshing it only when it is known to be
+    (nearly) expired and a refresh token is available.
+    """
+    with _TOKEN_LOCK:
+        access = _TOKEN_CACHE["access"]
+        refresh = _TOKEN_CACHE["refresh"]
+        expires_at = _TOKEN_CACHE["expires_at"]
+        if expires_at is None or time.time() < expires_at or not refresh:
+            return access
+        # Refresh under the lock so concurrent callers don't refresh twice
+        new_access, _ = refresh_access_token(refresh)
+        return new_access or access
+
 
 def get_auth_url():
     """
@@ -36,11 +80,8 @@ def exchange_code_for_token(auth_code):
     Returns access_token, refresh_token.
     """
     # Pinterest uses Basic Auth for token exchange
-    credentials = f"{Config.PINTEREST_APP_ID}:{Config.PINTEREST_APP_SECRET}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    
     headers = {
-        "Authorization": f"Basic {encoded_credentials}",
+        "Authorization": Config.PINTEREST_BASIC_AUTH,
         "Content-Type": "application/x-www-form-urlencoded"
     }
     
@@ -50,24 +91,22 @@ def exchange_code_for_token(auth_code):
         "redirect_uri": Config.PINTEREST_REDIRECT_URI
     }
     
-    response = requests.post(PINTEREST_TOKEN_URL, headers=headers, data=data)
+    response = get_session().post(PINTEREST_TOKEN_URL, headers=headers, data=data)
     
     if response.status_code == 200:
         tokens = response.json()
-        print("[Pinterest] Token exchange successful!")
+        _cache_tokens(tokens)
+        logger.info("[Pinterest] Token exchange successful!")
         return tokens["access_token"], tokens.get("refresh_token")
     else:
-        print(f"[Pinterest] Token exchange failed: {response.text}")
+        logger.error("[Pinterest] Token exchange failed: %s", response.text)
         return None, None
 
 
 def refresh_access_token(refresh_token):
     """Refresh the access token using the refresh token."""
-    credentials = f"{Config.PINTEREST_APP_ID}:{Config.PINTEREST_APP_SECRET}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    
     headers = {
-        "Authorization": f"Basic {encoded_credentials}",
+        "Authorization": Config.PINTEREST_BASIC_AUTH,
         "Content-Type": "application/x-www-form-urlencoded"
     }
     
@@ -76,13 +115,14 @@ def refresh_access_token(refresh_token):
         "refresh_token": refresh_token
     }
     
-    response = requests.post(PINTEREST_TOKEN_URL, headers=headers, data=data)
+    response = get_session().post(PINTEREST_TOKEN_URL, headers=headers, data=data)
     
     if response.status_code == 200:
         tokens = response.json()
+        _cache_tokens(tokens)
         return tokens["access_token"], tokens.get("refresh_token")
     else:
-        print(f"[Pinterest] Token refresh failed: {response.text}")
+        logger.error("[Pinterest] Token refresh failed: %s", response.text)
         return None, None
 
 
@@ -100,11 +140,11 @@ def create_pin(title, description, link, image_url=None, alt_text="Digital Produ
     Returns:
         Pin ID if successful, None otherwise.
     """
-    access_token = Config.PINTEREST_ACCESS_TOKEN
+    access_token = get_access_token()
     board_id = Config.PINTEREST_BOARD_ID
     
     if not access_token or not board_id:
-        print("[Pinterest] Missing access token or board ID. Run OAuth first.")
+        logger.warning("[Pinterest] Missing access token or board ID. Run OAuth first.")
         return None
     
     url = f"{PINTEREST_API_BASE}/pins"
@@ -130,15 +170,15 @@ def create_pin(title, description, link, image_url=None, alt_text="Digital Produ
         "alt_text": alt_text
     }
     
-    response = requests.post(url, headers=headers, json=data)
+    response = get_session().post(url, headers=headers, json=data)
     
     if response.status_code in [200, 201]:
         pin = response.json()
         pin_id = pin.get("id")
-        print(f"[Pinterest] Pin created! ID: {pin_id}")
+        logger.info("[Pinterest] Pin created! ID: %s", pin_id)
         return pin_id
     else:
-        print(f"[Pinterest] Failed to create pin: {response.status_code} - {response.text}")
+        logger.error("[Pinterest] Failed to create pin: %s - %s", response.status_code, response.text)
         return None
 
 
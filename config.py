@@ -1,4 +1,5 @@
 
+import base64
 import os
 from dotenv import load_dotenv
 
@@ -17,6 +18,15 @@ class Config:
     PINTEREST_BOARD_ID = os.getenv("PINTEREST_BOARD_ID")
     PINTEREST_ACCESS_TOKEN = os.getenv("PINTEREST_ACCESS_TOKEN")
     PINTEREST_REFRESH_TOKEN = os.getenv("PINTEREST_REFRESH_TOKEN")
+    # Basic-Auth header for the OAuth token endpoint, encoded once at load time
+    PINTEREST_BASIC_AUTH = (
+        "Basic " + base64.b64encode(f"{PINTEREST_APP_ID}:{PINTEREST_APP_SECRET}".encode()).decode()
+        if PINTEREST_APP_ID and PINTEREST_APP_SECRET else None
+    )
+
+    # Optional: Redis pub/sub so WebSocket broadcasts reach clients on every
+    # worker (requires the broadcaster package)
+    REDIS_URL = os.getenv("REDIS_URL")
 
     # Validate configuration
     if not GOOGLE_APPLICATION_CREDENTIALS:
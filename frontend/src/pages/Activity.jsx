@@ -1,4 +1,5 @@
 import { useState, useEffect } from 'react'
+import { openSocket, parseMessage } from '../socket'
 import './Activity.css'
 
 function Activity() {
@@ -7,9 +8,15 @@ function Activity() {
 
     useEffect(() => {
         fetchActivities()
-        // Auto-refresh every 30 seconds
-        const interval = setInterval(fetchActivities, 30000)
-        return () => clearInterval(interval)
+        // New activity is pushed over the WebSocket instead of polled
+        const socket = openSocket()
+        socket.onmessage = async (event) => {
+            const message = await parseMessage(event)
+            if (message.type === 'activity') {
+                setActivities((prev) => [message.activity, ...prev].slice(0, 100))
+            }
+        }
+        return () => socket.close()
     }, [])
 
     const fetchActivities = async () => {
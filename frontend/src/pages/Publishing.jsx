@@ -1,4 +1,5 @@
 import { useState } from 'react'
+import { waitForJob } from '../socket'
 import './Publishing.css'
 
 function Publishing() {
@@ -16,7 +17,12 @@ function Publishing() {
                 body: JSON.stringify({ platform: 'pinterest' })
             })
             const data = await response.json()
-            setResults(data)
+            if (response.ok) {
+                // Publishing continues in the background; wait for its result
+                setResults(await waitForJob(data.id))
+            } else {
+                setResults({ success: false, message: data.detail })
+            }
         } catch (error) {
             setResults({ success: false, message: error.message })
         } finally {
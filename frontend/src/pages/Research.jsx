@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import TrendCard from '../components/TrendCard'
+import { waitForJob } from '../socket'
 import './Research.css'
 
 function Research() {
@@ -33,8 +34,10 @@ function Research() {
             const response = await fetch('/api/research/run', { method: 'POST' })
             const data = await response.json()
 
-            if (response.ok && data.success) {
-                setMessage(`✅ Found ${data.count} trends!`)
+            if (response.ok) {
+                // The run continues in the background; wait for its result
+                const result = await waitForJob(data.id)
+                setMessage(`✅ Found ${result.count} trends!`)
                 // Refresh the list
                 fetchResearch()
             } else {
@@ -43,7 +46,7 @@ function Research() {
                 console.error('Research failed:', errorDetail)
             }
         } catch (error) {
-            setMessage(`❌ Network error: ${error.message}`)
+            setMessage(`❌ ${error.message}`)
             console.error('Research error:', error)
         } finally {
             setResearching(false)
@@ -61,8 +64,9 @@ function Research() {
             })
             const data = await response.json()
 
-            if (response.ok && data.success) {
-                setMessage(`✅ Product created! Link: ${data.link}`)
+            if (response.ok) {
+                const result = await waitForJob(data.id)
+                setMessage(`✅ Product created! Link: ${result.link}`)
             } else {
                 // Show detailed error from API
                 const errorDetail = data.detail || 'Unknown error occurred'
@@ -70,7 +74,7 @@ function Research() {
                 console.error('Product creation failed:', errorDetail)
             }
         } catch (error) {
-            setMessage(`❌ Network error: ${error.message}`)
+            setMessage(`❌ Failed: ${error.message}`)
             console.error('Product creation error:', error)
         }
     }
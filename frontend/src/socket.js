@@ -0,0 +1,47 @@
+// WebSocket helpers for the backend's real-time events (/ws)
+
+export function openSocket() {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws'
+    return new WebSocket(`${protocol}://${window.location.host}/ws`)
+}
+
+// Decodes a message event; large broadcasts arrive as zlib-compressed
+// binary frames
+export async function parseMessage(event) {
+    if (typeof event.data === 'string') return JSON.parse(event.data)
+    const stream = event.data.stream().pipeThrough(new DecompressionStream('deflate'))
+    return JSON.parse(await new Response(stream).text())
+}
+
+// Resolves with a background job's result once it finishes, or rejects with
+// its error. State changes arrive as "job" events; the job is also fetched
+// once the socket is open in case it finished before we subscribed.
+export function waitForJob(jobId) {
+    return new Promise((resolve, reject) => {
+        const socket = openSocket()
+
+        const settle = (job) => {
+            if (job.state === 'done') {
+                socket.close()
+                resolve(job.result)
+            } else if (job.state === 'failed') {
+                socket.close()
+                reject(new Error(job.error))
+            }
+        }
+
+        socket.onopen = async () => {
+            try {
+                const response = await fetch(`/api/jobs/${jobId}`)
+                if (response.ok) settle(await response.json())
+            } catch (error) {
+                // Keep waiting for the event
+            }
+        }
+        socket.onmessage = async (event) => {
+            const message = await parseMessage(event)
+            if (message.type === 'job' && message.id === jobId) settle(message)
+        }
+        socket.onerror = () => reject(new Error('Lost connection to the server'))
+    })
+}
@@ -1,8 +1,11 @@
 # Health Check Script
 # Validates environment configuration and API connectivity
 
+import importlib.util
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add project root to path
@@ -11,19 +14,42 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 
 
+# Output of checks running on worker threads is buffered per thread so
+# concurrent checks don't interleave their lines
+_output = threading.local()
+
+
+def emit(line: str = ""):
+    """Print a line, or buffer it while a check runs via run_buffered."""
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        print(line)
+    else:
+        lines.append(line)
+
+
+def run_buffered(check):
+    """Run a check, capturing its output; returns (result, lines)."""
+    _output.lines = lines = []
+    try:
+        return check(), lines
+    finally:
+        _output.lines = None
+
+
 def print_header(title: str):
     """Print a formatted header."""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    emit("\n" + "=" * 60)
+    emit(f"  {title}")
+    emit("=" * 60)
 
 
 def print_status(name: str, status: str, details: str = ""):
     """Print a status line."""
     icon = "✅" if status == "OK" else "❌" if status == "FAIL" else "⚠️"
-    print(f"{icon} {name}: {status}")
+    emit(f"{icon} {name}: {status}")
     if details:
-        print(f"   └─ {details}")
+        emit(f"   └─ {details}")
 
 
 def check_env_variables():
@@ -119,11 +145,11 @@ def check_google_sheets():
             
             # Check tabs
             tabs = [ws.title for ws in sheet.worksheets()]
-            print(f"   └─ Tabs: {', '.join(tabs)}")
+            emit(f"   └─ Tabs: {', '.join(tabs)}")
             return True
         else:
             print_status("System Memory Sheet", "FAIL", "Could not open sheet")
-            print("   └─ Check GOOGLE_SHEET_ID (should be the ID from the sheet URL)")
+            emit("   └─ Check GOOGLE_SHEET_ID (should be the ID from the sheet URL)")
             return False
             
     except Exception as e:
@@ -164,6 +190,15 @@ def check_telegram():
         return False
 
 
+def is_installed(package: str) -> bool:
+    """Check a package is importable without importing it."""
+    try:
+        # Only the finder runs; dotted names import just their parent packages
+        return importlib.util.find_spec(package) is not None
+    except ImportError:
+        return False  # Parent package missing
+
+
 def check_dependencies():
     """Check if required packages are installed."""
     print_header("DEPENDENCIES")
@@ -186,19 +221,17 @@ def check_dependencies():
     
     print("\n[Required]")
     for package, name in packages:
-        try:
-            __import__(package)
+        if is_installed(package):
             print_status(name, "OK")
-        except ImportError:
+        else:
             print_status(name, "FAIL", f"Missing: pip install {package.split('.')[0]}")
             all_ok = False
     
     print("\n[Optional]")
     for package, name in optional_packages:
-        try:
-            __import__(package)
+        if is_installed(package):
             print_status(name, "OK")
-        except ImportError:
+        else:
             print_status(name, "SKIP", "Not installed")
     
     return all_ok
@@ -215,10 +248,22 @@ def run_health_check():
         "Environment Variables": check_env_variables(),
         "Credentials File": check_credentials_file(),
         "Dependencies": check_dependencies(),
-        "Telegram Bot": check_telegram(),
-        "Google Sheets": check_google_sheets(),
     }
     
+    # Network probes are independent, so run them concurrently; their output
+    # is replayed in order once each finishes
+    network_checks = {
+        "Telegram Bot": check_telegram,
+        "Google Sheets": check_google_sheets,
+    }
+    with ThreadPoolExecutor(max_workers=len(network_checks)) as pool:
+        futures = {name: pool.submit(run_buffered, check) for name, check in network_checks.items()}
+        for name, future in futures.items():
+            result, lines = future.result()
+            for line in lines:
+                print(line)
+            results[name] = result
+    
     # Summary
     print_header("SUMMARY")
     
@@ -4,24 +4,51 @@ Web-based interface replacing Telegram bot
 """
 
 import asyncio
+import functools
+import json
 import logging
-from typing import List, Optional
-from datetime import datetime
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Set
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import BackgroundTasks, FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+try:
+    from broadcaster import Broadcast
+except ImportError:  # Optional: only needed to run with several workers
+    Broadcast = None
+
+from config import Config
 from app.agents.research_agent import ResearchAgent
 from app.agents.creation_agent import CreationAgent
+from app.agents.publishing_agent import PublishingAgent
+from app.utils import local_db
 from app.utils.local_db import (
     init_db,
     log_activity,
+    get_last_activity,
     get_latest_research_run,
     delete_research_item,
-    delete_latest_research_run,
-    save_product,
-    get_all_products
+    delete_latest_research_run
+)
+from app.utils.google_sheets import (
+    add_activity_listener,
+    get_revenue,
+    get_sheet,
+    get_tab_records,
+    get_tab_tail,
+    setup_tabs
 )
 
 # Configure logging
@@ -31,11 +58,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def dumps(message: dict) -> str:
+    """Serializes a WebSocket message to compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Business Partner",
     description="Automated digital product business platform",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=DefaultResponse
 )
 
 # CORS for frontend
@@ -49,37 +84,196 @@ app.add_middleware(
 
 # WebSocket connection manager
 class ConnectionManager:
+    # Messages buffered per client; a client this far behind is disconnected
+    QUEUE_SIZE = 256
+    # Broadcasts at least this large go out zlib-compressed as binary frames,
+    # compressed once for all clients; smaller ones aren't worth it
+    COMPRESS_MIN_SIZE = 1024
+    # Pub/sub channel that carries broadcasts between workers
+    CHANNEL = "events"
+    # Resubscribe backoff (seconds) after the pub/sub subscription fails
+    RELAY_RETRY_DELAY = 1.0
+    RELAY_RETRY_MAX_DELAY = 30.0
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Each client gets an outbound queue drained by its own writer task,
+        # so broadcasting never waits on a slow client
+        self.queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writers: Dict[WebSocket, asyncio.Task] = {}
+        # With several workers, broadcasts go through pub/sub and every
+        # worker's relay delivers them to its own clients
+        self.pubsub = None
+        self.relay: Optional[asyncio.Task] = None
+        self.relaying = False  # Subscribed; until then broadcasts stay local
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.active_connections.add(websocket)
+        self.queues[websocket] = queue
+        self.writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        # May already have been dropped by its writer or a full queue
+        self.active_connections.discard(websocket)
+        self.queues.pop(websocket, None)
+        writer = self.writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Sends queued payloads to one client until it fails or disconnects."""
+        try:
+            while True:
+                payload = await queue.get()
+                if isinstance(payload, bytes):
+                    await websocket.send_bytes(payload)
+                else:
+                    await websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(websocket)
+
+    async def _evict(self, websocket: WebSocket):
+        """Closes a client that stopped keeping up with broadcasts."""
+        self.disconnect(websocket)
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Queues a message for one client; its writer task does the send."""
+        queue = self.queues.get(websocket)
+        if queue is None:
+            return  # Already disconnected
+        try:
+            queue.put_nowait(dumps(message))
+        except asyncio.QueueFull:
+            await self._evict(websocket)
+
+    async def use_pubsub(self, pubsub):
+        """Routes broadcasts through a connected broadcaster.Broadcast."""
+        self.pubsub = pubsub
+        self.relay = asyncio.create_task(self._relay())
+
+    async def close_pubsub(self):
+        if self.relay is not None:
+            self.relay.cancel()
+        if self.pubsub is not None:
+            await self.pubsub.disconnect()
+
+    async def _relay(self):
+        """Delivers messages published by any worker to this worker's clients, resubscribing on failure."""
+        delay = self.RELAY_RETRY_DELAY
+        while True:
+            try:
+                async with self.pubsub.subscribe(channel=self.CHANNEL) as subscriber:
+                    self.relaying = True
+                    delay = self.RELAY_RETRY_DELAY
+                    async for event in subscriber:
+                        await self._deliver(event.message)
+                logger.warning("Pub/sub subscription ended; resubscribing in %.0fs", delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Pub/sub relay failed; resubscribing in %.0fs", delay)
+            finally:
+                self.relaying = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RELAY_RETRY_MAX_DELAY)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+        payload = dumps(message)
+        if self.pubsub is not None and self.relaying:
+            try:
+                await self.pubsub.publish(channel=self.CHANNEL, message=payload)
+                return
+            except Exception:
+                logger.exception("Pub/sub publish failed; delivering to this worker only")
+        await self._deliver(payload)
+
+    async def _deliver(self, payload: str):
+        # Compress once and hand the payload to every client's queue
+        # without waiting for any send
+        if len(payload) >= self.COMPRESS_MIN_SIZE:
+            payload = zlib.compress(payload.encode(), 1)
+        for connection, queue in list(self.queues.items()):
             try:
-                await connection.send_json(message)
-            except:
-                pass
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                await self._evict(connection)
 
 manager = ConnectionManager()
 
+# Bounded executor per agent, so a burst of one workload can't starve the
+# others or the default executor shared by the rest of the process. Research
+# gets one worker: ResearchAgent keeps per-run state (the run timestamp), so
+# runs of the shared instance must take turns
+RESEARCH_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="research")
+CREATE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="create")
+PUBLISH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="publish")
+
+# One instance of each agent per process, created on first use so their
+# clients and sessions are reused across requests
+@functools.lru_cache(maxsize=1)
+def research_agent() -> ResearchAgent:
+    return ResearchAgent()
+
+@functools.lru_cache(maxsize=1)
+def creation_agent() -> CreationAgent:
+    return CreationAgent()
+
+@functools.lru_cache(maxsize=1)
+def publishing_agent() -> PublishingAgent:
+    return PublishingAgent()
+
+# Agent runs triggered over HTTP are background jobs: the request returns
+# 202 with the job, and each state change (queued, running, done, failed)
+# is broadcast as a "job" event and readable from /api/jobs/{id}
+JOB_HISTORY = 100  # Most recent jobs kept for lookup
+jobs: Dict[str, dict] = {}
+
+def _new_job(kind: str) -> dict:
+    job = {"id": uuid.uuid4().hex, "kind": kind, "state": "queued"}
+    jobs[job["id"]] = job
+    while len(jobs) > JOB_HISTORY:
+        jobs.pop(next(iter(jobs)))  # Oldest first (insertion order)
+    return job
+
+async def _update_job(job: dict, state: str, **fields):
+    job.update(state=state, **fields)
+    await manager.broadcast({"type": "job", **job})
+
+# Most recent agent activity, kept current by push events for /api/status
+latest_activity: Optional[dict] = None
+
+def _on_activity(entry: dict):
+    """Records an agent activity and pushes it to WebSocket clients (runs on the event loop)."""
+    global latest_activity
+    latest_activity = entry
+    asyncio.create_task(manager.broadcast({"type": "activity", "activity": entry}))
+
 # Pydantic models
+# Request bodies are read-only; unknown fields are dropped rather than stored
+REQUEST_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
 class TrendData(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
     keyword: str
     platform: Optional[str] = "Multi-Source"
     signal: Optional[float] = 0
     notes: Optional[str] = ""
 
 class CreateProductRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
     keyword: str
     platform: Optional[str] = "Web"
 
 class PublishRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
     platform: str = "pinterest"  # "pinterest" only
 
 
@@ -91,20 +285,55 @@ async def startup():
     logger.info("🚀 AI Business Partner API starting...")
     init_db()
     logger.info("✅ Local database initialized")
+    # Every activity is pushed: agents log to Sheets from worker threads and
+    # user actions go to the local db, so hop onto the loop before broadcasting
+    loop = asyncio.get_running_loop()
+    push_activity = lambda entry: loop.call_soon_threadsafe(_on_activity, entry)
+    add_activity_listener(push_activity)
+    local_db.add_activity_listener(push_activity)
+    # Sheets I/O runs off the event loop so startup isn't held up by it
+    try:
+        await loop.run_in_executor(None, setup_tabs)
+        logger.info("✅ Google Sheets tabs ready")
+    except Exception as e:
+        logger.warning("Google Sheets tab setup failed: %s", e)
+    if Config.REDIS_URL:
+        if Broadcast is None:
+            logger.warning("REDIS_URL is set but broadcaster is not installed; broadcasts stay on this worker")
+        else:
+            pubsub = Broadcast(Config.REDIS_URL)
+            await pubsub.connect()
+            await manager.use_pubsub(pubsub)
+            logger.info("✅ Broadcasting through Redis pub/sub")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the agent executors (queued jobs are cancelled) and pub/sub."""
+    for pool in (RESEARCH_POOL, CREATE_POOL, PUBLISH_POOL):
+        pool.shutdown(wait=False, cancel_futures=True)
+    await manager.close_pubsub()
 
 @app.get("/api/status")
 async def get_status():
     """Get system status and last activity."""
+    # Served from pushed events or the local activity log; never a Google
+    # Sheets round-trip
+    last_activity = latest_activity
+    if last_activity is None:
+        # The local lookup flushes buffered log rows (a SQLite write first)
+        loop = asyncio.get_event_loop()
+        last_activity = await loop.run_in_executor(None, get_last_activity)
     return {
         "status": "online",
         "version": "2.0.0",
-        "last_activity": None
+        "last_activity": last_activity
     }
 
 @app.get("/api/revenue")
 async def api_get_revenue():
     """Get total revenue."""
-    total = get_revenue()
+    loop = asyncio.get_event_loop()
+    total = await loop.run_in_executor(None, get_revenue)
     return {"total": total, "currency": "USD"}
 
 
@@ -122,18 +351,16 @@ async def get_research():
         logger.error(f"Research fetch error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/research/run")
-async def run_research():
-    """Trigger the research agent to create a new research run."""
-    logger.info("Starting new research run")
-    await manager.broadcast({"type": "status", "message": "Starting research..."})
+async def _research_job(job: dict):
+    """Runs the research agent for a job."""
+    await _update_job(job, "running")
     
     try:
-        researcher = ResearchAgent()
+        researcher = research_agent()
         
         # Run in thread pool to not block
         loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(None, researcher.run)
+        results = await loop.run_in_executor(RESEARCH_POOL, researcher.run)
         
         logger.info(f"Research complete: {len(results)} trends found")
         await manager.broadcast({
@@ -142,22 +369,31 @@ async def run_research():
             "count": len(results)
         })
         
-        return {
+        await _update_job(job, "done", result={
             "success": True,
             "count": len(results)
-        }
+        })
     except RuntimeError as e:
         # Specific error from ResearchAgent
         error_msg = str(e)
         logger.error(f"Research agent error: {error_msg}")
         await manager.broadcast({"type": "error", "message": error_msg})
-        raise HTTPException(status_code=500, detail=error_msg)
+        await _update_job(job, "failed", error=error_msg)
     except Exception as e:
         # Unexpected error
         error_msg = f"Unexpected error during research: {str(e)}"
         logger.error(error_msg, exc_info=True)
         await manager.broadcast({"type": "error", "message": error_msg})
-        raise HTTPException(status_code=500, detail=error_msg)
+        await _update_job(job, "failed", error=error_msg)
+
+@app.post("/api/research/run", status_code=202)
+async def run_research(background_tasks: BackgroundTasks):
+    """Trigger the research agent to create a new research run (as a background job)."""
+    logger.info("Starting new research run")
+    await manager.broadcast({"type": "status", "message": "Starting research..."})
+    job = _new_job("research")
+    background_tasks.add_task(_research_job, job)
+    return job
 
 @app.delete("/api/research/{keyword}")
 async def delete_research_keyword(keyword: str):
@@ -210,39 +446,36 @@ async def clear_latest_research():
 
 # ==================== PRODUCT ENDPOINTS ====================
 
+def _read_products(ignore_cache: bool):
+    """Blocking Sheets read behind /api/products; run in an executor."""
+    if not get_sheet():
+        raise RuntimeError("Failed to connect to Google Sheets")
+    # Briefly cached; ?ignore_cache=1 forces a fresh read
+    return get_tab_records("products", "Products", ignore_cache=ignore_cache)
+
 @app.get("/api/products")
-async def get_products():
+async def get_products(ignore_cache: bool = False):
     """Get all products from Google Sheets."""
-    sheet = get_sheet()
-    if not sheet:
-        raise HTTPException(status_code=500, detail="Failed to connect to Google Sheets")
-    
     try:
-        try:
-            ws = sheet.worksheet("products")
-        except:
-            ws = sheet.worksheet("Products")
-        
-        records = ws.get_all_records()
+        loop = asyncio.get_event_loop()
+        records = await loop.run_in_executor(None, _read_products, ignore_cache)
         return {"products": records}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/products/create")
-async def create_product(request: CreateProductRequest):
-    """Create a new product from a trend keyword."""
-    logger.info(f"Product creation requested for: {request.keyword}")
-    await manager.broadcast({"type": "status", "message": f"Creating product: {request.keyword}"})
+async def _create_product_job(job: dict, request: CreateProductRequest):
+    """Runs the creation agent for a job."""
+    await _update_job(job, "running")
     
     try:
-        creator = CreationAgent()
+        creator = creation_agent()
         trend_data = {
             "keyword": request.keyword,
             "platform": request.platform
         }
         
         loop = asyncio.get_event_loop()
-        link = await loop.run_in_executor(None, creator.run, trend_data)
+        link = await loop.run_in_executor(CREATE_POOL, creator.run, trend_data)
         
         # CreationAgent now raises RuntimeError on failure, so if we get here it succeeded
         logger.info(f"Product created successfully: {link}")
@@ -251,35 +484,43 @@ async def create_product(request: CreateProductRequest):
             "message": f"Product created: {request.keyword}",
             "link": link
         })
-        return {"success": True, "link": link}
+        await _update_job(job, "done", result={"success": True, "link": link})
             
     except RuntimeError as e:
         # Specific error from CreationAgent
         error_msg = str(e)
         logger.error(f"Creation agent error: {error_msg}")
         await manager.broadcast({"type": "error", "message": error_msg})
-        raise HTTPException(status_code=500, detail=error_msg)
+        await _update_job(job, "failed", error=error_msg)
         
     except Exception as e:
         # Unexpected error
         error_msg = f"Unexpected error creating product: {str(e)}"
         logger.error(error_msg, exc_info=True)
         await manager.broadcast({"type": "error", "message": error_msg})
-        raise HTTPException(status_code=500, detail=error_msg)
+        await _update_job(job, "failed", error=error_msg)
+
+@app.post("/api/products/create", status_code=202)
+async def create_product(request: CreateProductRequest, background_tasks: BackgroundTasks):
+    """Create a new product from a trend keyword (as a background job)."""
+    logger.info(f"Product creation requested for: {request.keyword}")
+    await manager.broadcast({"type": "status", "message": f"Creating product: {request.keyword}"})
+    job = _new_job("create")
+    background_tasks.add_task(_create_product_job, job, request)
+    return job
 
 
 # ==================== PUBLISHING ENDPOINTS ====================
 
-@app.post("/api/publish")
-async def publish_product(request: PublishRequest):
-    """Publish product to Pinterest for marketing automation."""
-    await manager.broadcast({"type": "status", "message": f"Publishing to {request.platform}..."})
+async def _publish_job(job: dict, request: PublishRequest):
+    """Runs the publishing agent for a job."""
+    await _update_job(job, "running")
     
     try:
-        publisher = PublishingAgent()
+        publisher = publishing_agent()
         
         loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(None, publisher.run, request.platform)
+        results = await loop.run_in_executor(PUBLISH_POOL, publisher.run, request.platform)
         
         await manager.broadcast({
             "type": "publish_complete",
@@ -287,47 +528,67 @@ async def publish_product(request: PublishRequest):
             "results": results
         })
         
-        return results
+        await _update_job(job, "done", result=results)
         
     except Exception as e:
         logger.error(f"Publishing error: {e}")
         await manager.broadcast({"type": "error", "message": str(e)})
-        raise HTTPException(status_code=500, detail=str(e))
+        await _update_job(job, "failed", error=str(e))
+
+@app.post("/api/publish", status_code=202)
+async def publish_product(request: PublishRequest, background_tasks: BackgroundTasks):
+    """Publish product to Pinterest for marketing automation (as a background job)."""
+    await manager.broadcast({"type": "status", "message": f"Publishing to {request.platform}..."})
+    job = _new_job("publish")
+    background_tasks.add_task(_publish_job, job, request)
+    return job
+
+
+# ==================== JOBS ====================
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the state (and result or error, once finished) of a background job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 # ==================== ACTIVITY LOG ====================
 
+@dataclass(slots=True)
+class ActivityEntry:
+    """One activity log row as served by /api/activity."""
+    timestamp: str
+    agent: str
+    action: str
+    result: str
+
+def _read_activity(limit: int, ignore_cache: bool):
+    """Blocking Sheets read behind /api/activity; run in an executor."""
+    if not get_sheet():
+        raise RuntimeError("Failed to connect to Google Sheets")
+    # Only the last N entries are fetched (header excluded); briefly
+    # cached, ?ignore_cache=1 forces a fresh read
+    return get_tab_tail("daily_activity", "Activity Log", limit=limit, ignore_cache=ignore_cache)
+
 @app.get("/api/activity")
-async def get_activity(limit: int = 50):
+async def get_activity(limit: int = 50, ignore_cache: bool = False):
     """Get activity log."""
-    sheet = get_sheet()
-    if not sheet:
-        raise HTTPException(status_code=500, detail="Failed to connect to Google Sheets")
-    
     try:
-        try:
-            ws = sheet.worksheet("daily_activity")
-        except:
-            ws = sheet.worksheet("Activity Log")
-        
-        all_values = ws.get_all_values()
-        
-        if len(all_values) <= 1:
-            return {"activities": []}
-        
-        # Skip header, get last N entries
-        entries = all_values[1:][-limit:]
+        loop = asyncio.get_event_loop()
+        entries = await loop.run_in_executor(None, _read_activity, limit, ignore_cache)
         activities = [
-            {
-                "timestamp": row[0],
-                "agent": row[1],
-                "action": row[2],
-                "result": row[3] if len(row) > 3 else ""
-            }
-            for row in reversed(entries)  # Most recent first
+            ActivityEntry(*row)
+            for row in entries  # Already most recent first, padded to 4 columns
         ]
         
-        return {"activities": activities}
+        # Returned as a response directly so orjson serializes the rows
+        # natively, skipping FastAPI's per-row jsonable_encoder pass
+        if orjson is None:
+            activities = [asdict(entry) for entry in activities]
+        return DefaultResponse({"activities": activities})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -340,12 +601,14 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket for real-time updates."""
     await manager.connect(websocket)
     try:
-        await websocket.send_json({"type": "connected", "message": "Connected to AI Business Partner"})
+        # Replies go through the client's queue so only its writer task
+        # ever sends on the socket
+        await manager.send(websocket, {"type": "connected", "message": "Connected to AI Business Partner"})
         while True:
             # Keep connection alive
             data = await websocket.receive_text()
             # Echo back for ping/pong
-            await websocket.send_json({"type": "pong", "data": data})
+            await manager.send(websocket, {"type": "pong", "data": data})
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -357,4 +620,5 @@ if __name__ == "__main__":
     print("🤖 AI Business Partner Web API")
     print("📡 Starting server at http://localhost:8000")
     print("📖 API docs at http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Large broadcasts are compressed by the app; skip per-connection deflate
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws_per_message_deflate=False)